@@ -0,0 +1,207 @@
+# Operating system imports
+import os
+
+# Time and date
+import time
+
+# Function utilities
+import functools
+import inspect
+from collections import OrderedDict
+import threading
+
+# Pandas
+import pandas as pd
+
+
+# Seconds an entry stays valid for each dataset. Datasets not listed use "default".
+default_ttls = {
+    "default": 3600,
+    "prices": 3600,
+    "statements": 86400,
+    "earnings": 86400,
+    "filings": 86400,
+    "macro": 3600,
+}
+
+
+def copy_on_write_enabled() -> bool:
+    # Copy-on-Write is always enabled from pandas 3.0.
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, "copy_on_write", False) is True
+
+
+class FrameCache:
+    """
+    In-process LRU cache for the frames returned by the DataManager getters.
+
+    Entries are dropped when they are older than their dataset's TTL, when the file they were read from changed
+    on disk, or when invalidate() is called. Hits are returned as shallow copies when pandas Copy-on-Write is enabled,
+    so callers can modify the result without touching the cached frame.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, max_bytes: int = 2**30, ttls: dict = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(default_ttls)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        # Key -> (generation, created, mtime, size, frame)
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        # Incremented by invalidate(). Entries from an older generation are treated as misses.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.deep_copy = not copy_on_write_enabled()
+
+    """-------------------------------"""
+
+    def get(self, dataset: str, key, path: str = None):
+        """
+        :param dataset: Name of the dataset. Used to look up the TTL.
+        :param key: Hashable key identifying the request.
+        :param path: File the frame was read from. If its modification time changed the entry is stale.
+        :return: A copy of the cached frame, or None on a miss.
+        """
+        with self.lock:
+            entry = self.entries.get((dataset, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            generation, created, mtime, size, frame = entry
+            ttl = self.ttls.get(dataset, self.ttls["default"])
+            if (
+                generation != self.generation
+                or time.time() - created > ttl
+                or (path is not None and self.get_mtime(path) != mtime)
+            ):
+                self.remove((dataset, key))
+                self.misses += 1
+                return None
+            self.entries.move_to_end((dataset, key))
+            self.hits += 1
+        return frame.copy(deep=self.deep_copy)
+
+    """-------------------------------"""
+
+    def put(self, dataset: str, key, frame, path: str = None) -> None:
+        """
+        :param frame: DataFrame or Series to cache. Anything else is ignored.
+        :param path: File the frame was read from or written to.
+        """
+        if not isinstance(frame, (pd.DataFrame, pd.Series)):
+            return
+        size = int(frame.memory_usage(deep=False).sum())
+        if size > self.max_bytes:
+            return
+        # Keep a private copy so later changes made by the caller do not leak into the cache.
+        frame = frame.copy(deep=self.deep_copy)
+        mtime = self.get_mtime(path) if path is not None else None
+        with self.lock:
+            self.remove((dataset, key))
+            self.entries[(dataset, key)] = (
+                self.generation,
+                time.time(),
+                mtime,
+                size,
+                frame,
+            )
+            self.total_bytes += size
+            # Evict the least recently used entries.
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or self.total_bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self.entries))
+                self.remove(oldest_key)
+
+    """-------------------------------"""
+
+    def remove(self, entry_key) -> None:
+        entry = self.entries.pop(entry_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[3]
+
+    """-------------------------------"""
+
+    def invalidate(self, dataset: str = None, key=None) -> None:
+        """
+        :param dataset: Only drop the entries of this dataset. If None, every entry is dropped.
+        :param key: Only drop this key within the dataset.
+        """
+        with self.lock:
+            if dataset is None:
+                self.generation += 1
+                self.entries.clear()
+                self.total_bytes = 0
+            elif key is not None:
+                self.remove((dataset, key))
+            else:
+                for entry_key in [k for k in self.entries if k[0] == dataset]:
+                    self.remove(entry_key)
+
+    """-------------------------------"""
+
+    def get_mtime(self, path: str):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    """-------------------------------"""
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def cached_frame(dataset: str, path=None, ignore: tuple = ("write_data",)):
+    """
+    Decorator for DataManager getters. Results are stored in "self.cache".
+
+    :param dataset: Name of the dataset. Used to look up the TTL.
+    :param path: Function called with the instance and the getter's arguments. Returns the file backing the result.
+    :param ignore: Arguments that do not change the result, and are left out of the cache key.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+            force_update = arguments.pop("force_update", False)
+            for name in ignore:
+                arguments.pop(name, None)
+            # Tickers are not case sensitive.
+            if isinstance(arguments.get("ticker"), str):
+                arguments["ticker"] = arguments["ticker"].upper()
+            key = (func.__name__,) + tuple(sorted(arguments.items()))
+            file_path = path(self, **arguments) if path is not None else None
+
+            if not force_update:
+                frame = cache.get(dataset, key, file_path)
+                if frame is not None:
+                    return frame
+            frame = func(self, *args, **kwargs)
+            cache.put(dataset, key, frame, file_path)
+            return frame
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,216 @@
+# Operating system imports
+import os
+
+# Time and date
+import datetime as dt
+
+# Storage
+import sqlite3
+import hashlib
+import threading
+
+# Pandas
+import pandas as pd
+
+catalog_schema = """
+CREATE TABLE IF NOT EXISTS entries (
+    dataset TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    last_observation TEXT,
+    last_fetch TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    checksum TEXT,
+    PRIMARY KEY (dataset, ticker)
+);
+CREATE INDEX IF NOT EXISTS entries_last_observation ON entries (dataset, last_observation);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+entry_columns = [
+    "dataset",
+    "ticker",
+    "last_observation",
+    "last_fetch",
+    "row_count",
+    "checksum",
+]
+
+
+def frame_checksum(df: pd.DataFrame) -> str:
+    """
+    :return: sha1 of the frame's values and index. Changes when any value changes.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def format_observation(date) -> str:
+    """
+    Dates are stored as "YYYY-MM-DD", so they sort and compare as text. Ex: "2023-9" -> "2023-09-01"
+    """
+    if date is None:
+        return None
+    try:
+        return pd.Timestamp(date).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def format_ticker(dataset: str, ticker: str) -> str:
+    # Tickers are not case sensitive. Macro series names are kept as they are. Ex: "fed_funds"
+    return ticker if dataset == "macro" else ticker.upper()
+
+
+class Catalog:
+    """
+    SQLite index of the local data tree. One row per (dataset, ticker) holding the last observation, the last
+    time it was written, its number of rows and a checksum. Staleness checks and ticker listings are queries on
+    this table instead of reads of every file.
+
+    Datasets: "prices", "earnings", "macro" (ticker is the series name) and "{statement}_{freq}".
+    Ex: "income_statement_Quarter"
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # Writers run on the download threads, so the connection is shared behind a lock.
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(catalog_schema)
+
+    """-------------------------------"""
+
+    def record(
+        self,
+        dataset: str,
+        ticker: str,
+        last_observation,
+        row_count: int,
+        checksum: str = None,
+    ) -> None:
+        """
+        Insert or replace the entry of a file that was just written.
+
+        :param last_observation: Date of the newest row. Ex: "2023-10-05" or "2023-9"
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    dataset,
+                    format_ticker(dataset, ticker),
+                    format_observation(last_observation),
+                    dt.datetime.now().isoformat(timespec="seconds"),
+                    int(row_count),
+                    checksum,
+                ),
+            )
+
+    """-------------------------------"""
+
+    def record_frame(
+        self, dataset: str, ticker: str, df: pd.DataFrame, last_observation
+    ) -> None:
+        """
+        record() with the row count and checksum taken from the frame.
+        """
+        self.record(dataset, ticker, last_observation, len(df), frame_checksum(df))
+
+    """-------------------------------"""
+
+    def get_entry(self, dataset: str, ticker: str) -> dict:
+        """
+        :return: Dictionary with the "entry_columns", or None if the file is not in the catalog.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM entries WHERE dataset = ? AND ticker = ?",
+                (dataset, format_ticker(dataset, ticker)),
+            ).fetchone()
+        return dict(zip(entry_columns, row)) if row is not None else None
+
+    """-------------------------------"""
+
+    def get_entries(self, dataset: str) -> pd.DataFrame:
+        """
+        :return: Every entry of the dataset, one row per ticker.
+        """
+        with self.lock:
+            return pd.read_sql_query(
+                "SELECT * FROM entries WHERE dataset = ? ORDER BY ticker",
+                self.connection,
+                params=(dataset,),
+            )
+
+    """-------------------------------"""
+
+    def get_stale(self, dataset: str, day_threshold: int) -> list:
+        """
+        :return: Tickers whose last observation is at least "day_threshold" days old, or unknown.
+        """
+        cutoff = (dt.datetime.now() - dt.timedelta(days=day_threshold)).strftime(
+            "%Y-%m-%d"
+        )
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT ticker FROM entries WHERE dataset = ? "
+                "AND (last_observation <= ? OR last_observation IS NULL) ORDER BY ticker",
+                (dataset, cutoff),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    """-------------------------------"""
+
+    def get_tickers(self, dataset: str = "prices", limit: int = None) -> list:
+        """
+        :param limit: Maximum number of tickers. None for every ticker.
+        :return: Tickers of the dataset in alphabetical order.
+        """
+        query = "SELECT ticker FROM entries WHERE dataset = ? ORDER BY ticker"
+        params = (dataset,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (int(limit),)
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [row[0] for row in rows]
+
+    """-------------------------------"""
+
+    def get_meta(self, key: str) -> str:
+        """
+        :return: Value stored under "key" by set_meta, or None. Ex: get_meta("built_at") -> "2023-10-05T09:30:00"
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    """-------------------------------"""
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value)
+            )
+
+    """-------------------------------"""
+
+    def remove(self, dataset: str, ticker: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM entries WHERE dataset = ? AND ticker = ?",
+                (dataset, format_ticker(dataset, ticker)),
+            )
+
+    """-------------------------------"""
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
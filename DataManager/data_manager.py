@@ -6,6 +6,10 @@ import sys
 # Time and date
 import datetime as dt
 
+# Concurrency
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
 # Yahoo finance imports
 import yfinance as yf
 import yahoo_fin.stock_info as si
@@ -15,21 +19,50 @@ path = os.path.join(cwd, "FinancialScrapers\\Scrapers")
 sys.path.append(path)
 
 # Now you can use relative imports
-from FinancialScrapers.Scrapers.macro_scraper import MacroScraper
+from FinancialScrapers.Scrapers.macro_scraper import (
+    MacroScraper,
+    fred_series,
+    get_series_config,
+)
 from FinancialScrapers.Scrapers.equity_scraper import EquityScraper
 from FinancialScrapers.Scrapers.etf_scraper import EtfScraper
 from FinancialScrapers.Scrapers.sec_scraper import SecScraper
 from FinancialScrapers.Scrapers.stock_analysis_scraper import StockAnalysis
 
-# Pandas
+# Local storage
+from FinancialScrapers.DataManager.price_store import create_price_store, CsvPriceStore
+from FinancialScrapers.DataManager.cache import FrameCache, cached_frame
+from FinancialScrapers.DataManager.universe_store import UniverseStore
+from FinancialScrapers.DataManager.macro_store import (
+    MacroStore,
+    parse_macro_frame,
+    release_panel,
+    align_to_dates,
+)
+from FinancialScrapers.DataManager.catalog import Catalog
+from FinancialScrapers.DataManager import indicators
+
+# Numpy & Pandas
+import numpy as np
 import pandas as pd
 from pandas.errors import EmptyDataError
 import random
 
+# yfinance collects the results of a download in module-global state, so two downloads must never run at the same time.
+yf_download_lock = threading.Lock()
+
 
 class DataManager:
     def __init__(
-        self, base_data_path: str, chrome_driver_path: str, log_data=True
+        self,
+        base_data_path: str,
+        chrome_driver_path: str,
+        log_data=True,
+        price_backend: str = "parquet",
+        use_cache: bool = True,
+        offline: bool = False,
+        statement_source: str = "alpha_vantage",
+        browser_profile: str = "fast",
     ) -> None:
         self.base_path = base_data_path
         self.commodities_folder = os.path.join(self.base_path, "CommoditiesData")
@@ -37,69 +70,400 @@ class DataManager:
         self.macro_folder = os.path.join(self.base_path, "MacroData")
         self.etf_folder = os.path.join(self.base_path, "EtfData")
         self.cik_folder = os.path.join(self.equities_folder, "CIK")
-        self.stock_analysis = StockAnalysis()
+        self.stock_analysis = StockAnalysis(
+            chrome_driver_path, browser_profile=browser_profile
+        )
         self.log_data = log_data
-        self.macro_scraper = MacroScraper()
-        self.equity_scraper = EquityScraper(chrome_driver_path)
+        self.macro_scraper = MacroScraper(
+            chrome_driver_path, browser_profile=browser_profile
+        )
+        self.sec_scraper = SecScraper(self.cik_folder, offline=offline)
+        # Alpha Vantage responses are cached on disk. In offline mode only the cached responses are used.
+        self.equity_scraper = EquityScraper(
+            chrome_driver_path,
+            cache_folder=os.path.join(self.equities_folder, "AlphaVantageCache"),
+            offline=offline,
+            sec_scraper=self.sec_scraper,
+            browser_profile=browser_profile,
+        )
         self.etf_scraper = EtfScraper()
-        self.sec_scraper = SecScraper(self.cik_folder)
         self.expired = 180
+        # Source of the financial statements. "alpha_vantage", or "sec" to build them from XBRL facts with no request quota.
+        self.statement_source = statement_source
+        # Storage backend for daily price history. "parquet" or "csv".
+        self.price_store = create_price_store(price_backend, self.equities_folder)
+        # Legacy csv files, read when a ticker is missing from another backend. Avoids downloading it again.
+        self.legacy_price_store = (
+            None
+            if isinstance(self.price_store, CsvPriceStore)
+            else CsvPriceStore(os.path.join(self.equities_folder, "Stocks"))
+        )
+        # Number of stored bars used to seed the indicators when new bars are appended.
+        self.indicator_warmup = 300
+        # In-memory cache shared by the getters. Entries are dropped when the file behind them changes.
+        self.cache = FrameCache() if use_cache else None
+        # Memory-mapped copy of the whole price store, used for universe scans.
+        self.universe_store = UniverseStore(
+            os.path.join(self.equities_folder, "Universe")
+        )
+        # Numeric copy of every macro series, aligned by month in one file.
+        self.macro_store = MacroStore(os.path.join(self.macro_folder, "Panel"))
+        # Last observation, row count and checksum of every file written, for staleness checks without reading files.
+        self.catalog = Catalog(os.path.join(self.base_path, "catalog.sqlite"))
 
     ##################################################################### Equity Price Fetching #####################################################################
-    def fetch_externally(self, ticker: str, period="max", interval="1d"):
-        df = yf.download(ticker, period=period, interval=interval)
+    def fetch_externally(
+        self, ticker: str, period="max", interval="1d", start: str = None
+    ):
+        """
+        :param ticker: Ticker of a company.
+        :param period: Length of history to download. Ignored if "start" is passed.
+        :param start: Only download bars on or after this date. Ex: 2023-10-05
+        """
+        with yf_download_lock:
+            if start is None:
+                df = yf.download(ticker, period=period, interval=interval)
+            else:
+                df = yf.download(ticker, start=start, interval=interval)
         return df
 
+    @cached_frame(
+        "prices", path=lambda self, ticker, **kwargs: self.price_store.get_path(ticker)
+    )
     def get_data(self, ticker: str, crypto: bool = False, force_update: bool = False):
         ticker = ticker.upper()
-        ticker_file = os.path.join(
-            self.equities_folder,
-            f"Stocks\\{ticker}\\{ticker}_prices.csv",
-        )
         # Force new data to be written locally.
         if force_update:
             df = self.fetch_externally(ticker)
-            df["Close_Pct_Change"] = df["Adj Close"].pct_change() * 100
-            df = self.calc_rsi(df)
-            df = self.calc_macd(df)
+            df = self.calc_indicators(df)
+            self.save_prices(ticker, df)
         else:
             # Try to read data locally.
-            try:
-                df = pd.read_csv(ticker_file)
-                df = df.set_index("Date")
+            df = self.price_store.read(ticker)
+            if df is None:
+                df = self.import_legacy_prices(ticker)
+            # Local data not found.
+            if df is None:
+                df = self.fetch_externally(ticker)
+                df = self.calc_indicators(df)
+                self.save_prices(ticker, df)  # Save locally
+            else:
                 latest_date = df.index[-1]
                 outdated = self.is_outdated(latest_date, day_threshold=5)
-                # If the local data is outdated.
+                # If the local data is outdated, only fetch the bars after the latest stored date.
                 if outdated:
-                    df = self.fetch_externally(ticker)
-                    df.to_csv(ticker_file)  # Save merged data locally.
-            # Local data not found.
-            except FileNotFoundError:
-                df = self.fetch_externally(ticker)
-                df["Close_Pct_Change"] = df["Adj Close"].pct_change() * 100
-                df = self.calc_rsi(df)
-                df = self.calc_macd(df)
-                df.to_csv(ticker_file)  # Save locally
+                    df = self.refresh_data(ticker, df)
+        return df
+
+    def refresh_data(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append the bars after the last stored date to "df", and save the result locally.
+
+        :param ticker: Ticker of a company.
+        :param df: Price history currently stored for the ticker.
+        :return: The updated price history.
+        """
+        latest_date = df.index[-1]
+        start = (latest_date + dt.timedelta(days=1)).date()
+        if start > dt.datetime.now().date():
+            return df
+        new_data = self.fetch_externally(ticker, start=str(start))
+        if new_data is None or new_data.empty:
+            return df
+        new_data = self.price_store.format_frame(new_data)
+        new_data = new_data[new_data.index > latest_date]
+        if new_data.empty:
+            return df
+        df = self.append_bars(df, new_data)
+        self.save_prices(ticker, df)  # Save merged data locally.
+        return df
+
+    def append_bars(self, df: pd.DataFrame, new_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append new bars to a stored price history, and calculate the indicators for the new bars only.
+
+        :param df: Stored price history, including the indicator columns.
+        :param new_data: Bars that come after the last date in "df".
+        :return: Merged price history.
+        """
+        # Older files written by the refresh path do not have any indicators. Calculate them for the full history.
+        if "RSI" not in df.columns or "MACD" not in df.columns:
+            return self.calc_indicators(pd.concat([df, new_data]))
+
+        # The indicators only depend on the previous bars, so the new rows are calculated over a warm up window.
+        # The EMAs decay by (1 - 2 / 27) ** 300 over the window, so the difference from a full recalculation is negligible.
+        warmup = df.iloc[-self.indicator_warmup :]
+        tail = pd.concat([warmup, new_data])
+        tail = self.calc_indicators(tail)
+        tail = tail.iloc[len(warmup) :]
+        return pd.concat([df, tail])
+
+    def save_prices(self, ticker: str, df: pd.DataFrame) -> None:
+        """
+        Write a ticker's price history to the price store and record it in the catalog.
+        """
+        self.price_store.write(ticker, df)
+        if not df.empty:
+            self.catalog.record_frame("prices", ticker, df, df.index[-1])
+
+    def fetch_many_externally(
+        self,
+        tickers: list,
+        period="max",
+        interval="1d",
+        start: str = None,
+        threads=False,
+    ) -> dict:
+        """
+        Download several tickers with a single yfinance call.
+
+        :param tickers: List of tickers.
+        :param start: Only download bars on or after this date. Ex: 2023-10-05
+        :param threads: Passed to yf.download. True or a number of threads to download the tickers in parallel.
+        :return: Dictionary of ticker -> frame. Tickers that returned no data are left out.
+        """
+        with yf_download_lock:
+            if start is None:
+                wide = yf.download(
+                    tickers,
+                    period=period,
+                    interval=interval,
+                    group_by="ticker",
+                    threads=threads,
+                )
+            else:
+                wide = yf.download(
+                    tickers,
+                    start=start,
+                    interval=interval,
+                    group_by="ticker",
+                    threads=threads,
+                )
+        return self.split_download(wide, tickers)
+
+    def split_download(self, wide: pd.DataFrame, tickers: list) -> dict:
+        """
+        :param wide: Frame returned by yf.download(..., group_by="ticker"). The first column level is the ticker.
+        :return: Dictionary of ticker -> frame with the regular OHLCV columns.
+        """
+        frames = {}
+        if wide is None or wide.empty:
+            return frames
+        # A single ticker may come back without the ticker level.
+        if not isinstance(wide.columns, pd.MultiIndex):
+            frames[tickers[0]] = wide.dropna(how="all")
+            return frames
+        available = set(wide.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in available:
+                continue
+            df = wide[ticker].dropna(how="all")
+            if not df.empty:
+                df.columns.name = None
+                frames[ticker] = df
+        return frames
+
+    def get_data_many(
+        self,
+        tickers: list,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        as_panel: bool = False,
+    ):
+        """
+        Batched version of get_data. Missing and outdated tickers are downloaded together in groups of "batch_size".
+
+        :param tickers: List of tickers.
+        :param batch_size: Number of tickers requested in each download.
+        :param max_workers: Threads yfinance uses inside each download, and threads that save the downloaded tickers.
+        :param as_panel: If True, return a single frame with (ticker, column) columns instead of a dictionary.
+        :return: Dictionary of ticker -> frame, or a panel if "as_panel" is True.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        frames = {}
+        missing = []
+        outdated = []
+        for ticker in tickers:
+            df = self.price_store.read(ticker)
+            if df is None:
+                df = self.import_legacy_prices(ticker)
+            if df is None:
+                missing.append(ticker)
+                continue
+            frames[ticker] = df
+            if self.is_outdated(df.index[-1], day_threshold=5):
+                outdated.append(ticker)
+
+        # Sort outdated tickers by their latest date, so each batch starts close to the dates it actually needs.
+        outdated.sort(key=lambda t: frames[t].index[-1])
+        today = dt.datetime.now().date()
+        jobs = []
+        for i in range(0, len(missing), batch_size):
+            jobs.append((missing[i : i + batch_size], None))
+        for i in range(0, len(outdated), batch_size):
+            batch = outdated[i : i + batch_size]
+            start = (frames[batch[0]].index[-1] + dt.timedelta(days=1)).date()
+            if start <= today:
+                jobs.append((batch, str(start)))
+
+        def save_job(ticker, start, new_data):
+            new_data = self.price_store.format_frame(new_data)
+            # Full history for a ticker that was not stored locally.
+            if start is None:
+                df = self.calc_indicators(new_data)
+            else:
+                latest_date = frames[ticker].index[-1]
+                new_data = new_data[new_data.index > latest_date]
+                if new_data.empty:
+                    return ticker, None
+                df = self.append_bars(frames[ticker], new_data)
+            self.save_prices(ticker, df)
+            return ticker, df
+
+        # Batches are downloaded one after another, since yf.download is not safe to call from several threads.
+        # yfinance spreads the tickers of a batch over its own threads, and the pool only saves the results.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for batch, start in jobs:
+                try:
+                    downloaded = self.fetch_many_externally(
+                        batch, start=start, threads=max_workers
+                    )
+                except Exception as e:
+                    print(f"[Error] Batch download failed: {e}")
+                    continue
+                for ticker, new_data in downloaded.items():
+                    futures.append(executor.submit(save_job, ticker, start, new_data))
+            for future in futures:
+                ticker, df = future.result()
+                if df is not None:
+                    frames[ticker] = df
+
+        # Keep the order the tickers were requested in.
+        frames = {ticker: frames[ticker] for ticker in tickers if ticker in frames}
+        if as_panel:
+            return pd.concat(frames, axis=1, names=["Ticker", "Price"])
+        return frames
+
+    def import_price_csvs(self, overwrite: bool = False) -> list:
+        """
+        Copy the legacy Stocks\\{ticker}\\{ticker}_prices.csv files into the configured price store.
+
+        :param overwrite: If False, tickers already in the price store are skipped.
+        :return: List of the tickers that were imported.
+        """
+        if isinstance(self.price_store, CsvPriceStore):
+            print("[Warning] Price store is already using csv files.")
+            return []
+        return self.price_store.import_csv_tree(
+            self.legacy_price_store,
+            overwrite=overwrite,
+            log_data=self.log_data,
+            write=self.save_prices,
+        )
+
+    def import_legacy_prices(self, ticker: str) -> pd.DataFrame:
+        """
+        Copy one ticker's legacy csv file into the price store.
+
+        :return: The stored frame, or None if the ticker has no legacy csv file.
+        """
+        if self.legacy_price_store is None:
+            return None
+        df = self.legacy_price_store.read(ticker)
+        if df is None or df.empty:
+            return None
+        self.save_prices(ticker, df)
         return df
 
+    def build_universe_store(self, tickers: list = None, fields: list = None) -> None:
+        """
+        Rebuild the memory-mapped universe store from the price store. Run after a refresh.
+
+        :param tickers: Tickers to include. Defaults to every ticker in the price store.
+        :param fields: Columns to include. Defaults to OHLCV.
+        """
+        self.universe_store.build(
+            self.price_store, tickers=tickers, fields=fields, log_data=self.log_data
+        )
+        self.universe_store.open()
+
+    def get_universe_values(self, ticker: str, field: str = "Close"):
+        """
+        :return: Tuple of (dates, values). "values" is a read-only view into the universe store, no data is copied.
+        """
+        return (
+            self.universe_store.get_dates(ticker),
+            self.universe_store.get_values(ticker, field),
+        )
+
+    def get_universe_matrix(
+        self,
+        field: str = "Close",
+        tickers: list = None,
+        start: str = None,
+        end: str = None,
+    ) -> pd.DataFrame:
+        """
+        :return: Dates x tickers frame of "field", aligned on the shared calendar.
+        """
+        return self.universe_store.get_matrix(
+            field, tickers=tickers, start=start, end=end
+        )
+
     def get_ticker_list(self, num_tickers: int = 500) -> list:
-        path = f"{self.equities_folder}\\Stocks"
-        # Get a list of folder names in the specified directory
-        folder_names = [
-            folder
-            for folder in os.listdir(path)
-            if os.path.isdir(os.path.join(path, folder))
-        ]
-        tickers = []
-        for folder_name in folder_names:
-            tickers.append(folder_name)
-
-        return tickers
+        """
+        :param num_tickers: Maximum number of tickers returned. None for every ticker.
+        :return: Tickers with stored prices, in alphabetical order.
+        """
+        self.ensure_catalog()
+        return self.catalog.get_tickers("prices", limit=num_tickers)
+
+    def get_stale_tickers(
+        self, dataset: str = "prices", day_threshold: int = 5
+    ) -> list:
+        """
+        :param dataset: Dataset of the catalog. Ex: "prices", "macro" or "income_statement_Quarter"
+        :return: Tickers whose last stored observation is at least "day_threshold" days old. Only the catalog is read.
+        """
+        self.ensure_catalog()
+        return self.catalog.get_stale(dataset, day_threshold)
+
+    def ensure_catalog(self) -> None:
+        """
+        Tickers written before the catalog existed are only found in the price store. They are recorded once, the
+        first time the catalog is queried. After that every write records itself, so the store is never listed again.
+        """
+        if self.catalog.get_meta("built_at") is None:
+            self.build_catalog()
+
+    def build_catalog(self) -> int:
+        """
+        Record every ticker already in the price store, and the macro panel, in the catalog. Runs once through
+        ensure_catalog(), for data written before the catalog existed. Run again after copying files in by hand.
+
+        :return: Number of tickers recorded.
+        """
+        tickers = self.price_store.list_tickers()
+        for ticker in tickers:
+            df = self.price_store.read(ticker)
+            if df is not None and not df.empty:
+                self.catalog.record_frame("prices", ticker, df, df.index[-1])
+        panel = self.macro_store.read_panel()
+        for series in panel.columns:
+            self.record_macro(series, panel[series].dropna())
+        self.catalog.set_meta(
+            "built_at", dt.datetime.now().isoformat(timespec="seconds")
+        )
+        return len(tickers)
 
     ##################################################################### Equity Earnings Fetching #####################################################################
+    @cached_frame(
+        "earnings", path=lambda self, ticker, **kwargs: self.get_earnings_path(ticker)
+    )
     def get_earnings(self, ticker: str, frequency: str = "q", expired: int = 90):
         # Path to earnings csv file for the ticker specified.
-        earnings_file_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\{ticker.upper()}_earnings.csv"
+        earnings_file_path = self.get_earnings_path(ticker)
 
         print(f"Earnings: {earnings_file_path}")
 
@@ -124,6 +488,7 @@ class DataManager:
                 merged_df = pd.concat([earnings_csv_data, earnings], ignore_index=True)
                 merged_df = merged_df.drop_duplicates()
                 merged_df.to_csv(earnings_file_path, header=True, index=False)
+                self.record_earnings(ticker, merged_df)
                 return merged_df
             else:
                 return earnings_csv_data
@@ -134,9 +499,17 @@ class DataManager:
                 ticker=ticker, frequency=frequency
             )
             earnings.to_csv(earnings_file_path, header=True, index=False)
+            self.record_earnings(ticker, earnings)
             return earnings
 
+    def record_earnings(self, ticker: str, earnings: pd.DataFrame) -> None:
+        last_report = pd.to_datetime(earnings["reportedDate"], errors="coerce").max()
+        self.catalog.record_frame(
+            "earnings", ticker, earnings, None if pd.isna(last_report) else last_report
+        )
+
     ##################################################################### Filing Dates #####################################################################
+    @cached_frame("filings", path=lambda self, **kwargs: self.get_filings_path())
     def get_filing_dates(self, ticker: str):
         """
         ticker: Ticker of a company.
@@ -145,7 +518,7 @@ class DataManager:
         """
         try:
             ticker = ticker.upper()
-            file_path = f"{self.equities_folder}\\Filings\\quarterly_filings.csv"
+            file_path = self.get_filings_path()
             csv_file = pd.read_csv(file_path)
 
             # Check if the ticker is in the csv file.
@@ -170,7 +543,15 @@ class DataManager:
                 # Update csv dataframe with new values.
                 csv_file = csv_file.from_records(organized_quarters)
 
-                csv_file.to_csv(file_path, mode="a", header=False, index=False)
+                self.write_csv(
+                    csv_file,
+                    file_path,
+                    "filings",
+                    ticker,
+                    mode="a",
+                    header=False,
+                    index=False,
+                )
                 ticker_found = csv_file[csv_file["ticker"] == ticker]
 
         except EmptyDataError:
@@ -192,32 +573,44 @@ class DataManager:
             # Update csv dataframe with new values.
             csv_file = csv_file.from_records(organized_quarters)
 
-            csv_file.to_csv(file_path, header=True, index=False)
+            self.write_csv(
+                csv_file, file_path, "filings", ticker, header=True, index=False
+            )
             ticker_found = csv_file[csv_file["ticker"] == ticker]
 
         return ticker_found
 
-    ##################################################################### TA Calculations #####################################################################
-    def calc_rsi(self, df: pd.DataFrame, rsi_period: int = 14) -> pd.DataFrame:
-        # Calculate daily price changes
-        df["Price Change"] = df["Close"].diff()
+    def build_filing_index(self, archive_path: str = None, forms: list = None) -> int:
+        """
+        Build the local filing index from the SEC bulk submissions archive. Filing lookups are served from it afterwards.
 
-        # Calculate average gains and losses
-        df["Gain"] = df["Price Change"].apply(lambda x: x if x > 0 else 0)
-        df["Loss"] = df["Price Change"].apply(lambda x: abs(x) if x < 0 else 0)
+        :param archive_path: Local copy of submissions.zip. Downloaded if not given.
+        :param forms: Form types to keep. Ex: ["10-K", "10-Q"]. None keeps every form.
+        """
+        return self.sec_scraper.build_filing_index(archive_path, forms=forms)
 
-        # Calculate average gains and average losses over the specified period
-        avg_gain = df["Gain"].rolling(window=rsi_period).mean()
-        avg_loss = df["Loss"].rolling(window=rsi_period).mean()
+    def build_fact_store(self, archive_path: str = None) -> int:
+        """
+        Build the local XBRL fact store from the SEC bulk companyfacts archive. Statements from the "sec" source are
+        served from it afterwards.
 
-        # Calculate relative strength (RS)
-        rs = avg_gain / avg_loss
+        :param archive_path: Local copy of companyfacts.zip. Downloaded if not given.
+        """
+        return self.sec_scraper.build_fact_store(archive_path)
 
-        # Calculate RSI
-        df["RSI"] = 100 - (100 / (1 + rs))
+    ##################################################################### TA Calculations #####################################################################
+    def calc_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col, values in indicators.calc_all(df["Close"], df["Adj Close"]).items():
+            df[col] = values
+        # Older files still have the intermediate column from the previous RSI calculation.
+        df = df.drop(columns=["Price Change"], errors="ignore")
+        return df
 
-        # Drop intermediate columns used for calculations
-        df = df.drop(["Gain", "Loss"], axis=1)
+    def calc_rsi(self, df: pd.DataFrame, rsi_period: int = 14) -> pd.DataFrame:
+        # RSI with Wilder's smoothing.
+        df["RSI"] = indicators.rsi(df["Close"], period=rsi_period)
+        # Older files still have the intermediate column from the previous calculation.
+        df = df.drop(columns=["Price Change"], errors="ignore")
         return df
 
     def calc_macd(
@@ -227,32 +620,37 @@ class DataManager:
         slow_ma_period: int = 26,
         signal_period: int = 9,
     ) -> pd.DataFrame:
-        # Calculate 12-day EMA
-        df["EMA_12"] = df["Close"].ewm(span=fast_ma_period, adjust=False).mean()
-
-        # Calculate 26-day EMA
-        df["EMA_26"] = df["Close"].ewm(span=slow_ma_period, adjust=False).mean()
-
-        # Calculate MACD line
-        df["MACD"] = df["EMA_12"] - df["EMA_26"]
-
-        # Calculate Signal line (typically a 9-day EMA of the MACD line)
-        df["Signal_Line"] = df["MACD"].ewm(span=signal_period, adjust=False).mean()
-
-        # Calculate MACD Histogram (the difference between the MACD and Signal line)
-        df["MACD_Histogram"] = df["MACD"] - df["Signal_Line"]
-
-        # Drop intermediate columns used for calculations
-        df = df.drop(["EMA_12", "EMA_26"], axis=1)
+        macd = indicators.macd(
+            df["Close"],
+            fast_period=fast_ma_period,
+            slow_period=slow_ma_period,
+            signal_period=signal_period,
+        )
+        for col, values in macd.items():
+            df[col] = values
         return df
 
     def calc_fib_retracement(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["Retracement_38.2"] = df["High"] - 0.382 * (df["High"] - df["Low"])
-        df["Retracement_50"] = df["High"] - 0.5 * (df["High"] - df["Low"])
-        df["Retracement_61.8"] = df["High"] - 0.618 * (df["High"] - df["Low"])
-
+        for col, values in indicators.fib_retracement(df["High"], df["Low"]).items():
+            df[col] = values
         return df
 
+    def calc_universe_indicators(
+        self, tickers: list = None, start: str = None, end: str = None
+    ) -> dict:
+        """
+        Calculate the indicators for many tickers at once, from the universe store.
+
+        :param tickers: Tickers to include. Defaults to every ticker in the universe store.
+        :return: Dictionary of indicator name -> dates x tickers frame.
+        """
+        close = self.get_universe_matrix("Close", tickers=tickers, start=start, end=end)
+        adj_close = self.get_universe_matrix(
+            "Adj Close", tickers=tickers, start=start, end=end
+        )
+        # Days a ticker did not trade are NaN in the matrix, and are skipped by the calculations.
+        return indicators.calc_all(close, adj_close)
+
     ##################################################################### DataFrame Sampling #####################################################################
     def get_sample_size(
         self, df: pd.DataFrame, sample_size: int = 300, start: int = 0, end: int = 0
@@ -285,35 +683,211 @@ class DataManager:
         return sampled_df
 
     ##################################################################### Macro Data #####################################################################
+    @cached_frame("macro", path=lambda self: self.get_macro_path("cpi"))
     def get_cpi(self) -> pd.DataFrame:
-        file_path = f"{self.macro_folder}\\CPI\\cpi.csv"
+        file_path = self.get_macro_path("cpi")
         data = pd.read_csv(file_path)
         # Update csv if outdated.
         if self.is_outdated(data["Date"].iloc[0]):
             self.macro_scraper.update_cpi(path_to_update=file_path)
             data = pd.read_csv(file_path)  # Read again after updating
+            self.store_macro_series("cpi", data)
         return data
 
+    @cached_frame("macro", path=lambda self: self.get_macro_path("fed_funds"))
     def get_fed_funds(self) -> pd.DataFrame:
-        file_path = f"{self.macro_folder}\\FedFunds\\fed_funds.csv"
+        file_path = self.get_macro_path("fed_funds")
         data = pd.read_csv(file_path)
         # Update csv if outdated.
         if self.is_outdated(data["Date"].iloc[0]):
             self.macro_scraper.update_fed_funds(path_to_update=file_path)
             data = pd.read_csv(file_path)  # Read again after updating
+            self.store_macro_series("fed_funds", data)
         return data
 
-    def get_fed_funds(self) -> pd.DataFrame:
-        file_path = f"{self.macro_folder}\\Treasury_Yield_Spread_10Y_2Y\\Treasury_Yield_Spread_10Y_2Y.csv"
-        print(f"File: {file_path}")
+    @cached_frame(
+        "macro", path=lambda self: self.get_macro_path("treasury_yield_spread")
+    )
+    def get_treasury_yield_spread(self) -> pd.DataFrame:
+        file_path = self.get_macro_path("treasury_yield_spread")
         data = pd.read_csv(file_path)
         # Update csv if outdated.
         if self.is_outdated(data["Date"].iloc[0]):
             self.macro_scraper.update_treasury_yield_spread(path_to_update=file_path)
             data = pd.read_csv(file_path)  # Read again after updating
+            self.store_macro_series("treasury_yield_spread", data)
+        return data
+
+    @cached_frame("macro", path=lambda self, series: self.get_macro_path(series))
+    def get_macro_series(self, series: str) -> pd.DataFrame:
+        """
+        Get any FRED series. Outdated series are updated with the new observations only.
+
+        :param series: Key of macro_scraper.fred_series, or a FRED series id. Ex: "fed_funds" or "DGS10"
+        """
+        file_path = self.get_macro_path(series)
+        if os.path.exists(file_path):
+            data = pd.read_csv(file_path)
+            if data.empty or not self.is_outdated(data["Date"].iloc[0]):
+                return data
+        if not self.macro_scraper.update_series(series, path_to_update=file_path):
+            if os.path.exists(file_path):
+                return data
+            return pd.DataFrame(columns=["Date", self.get_macro_column(series)])
+        data = pd.read_csv(file_path)
+        self.store_macro_series(series, data)
         return data
 
+    def refresh_macro(self, series: list = None, max_workers: int = 8) -> list:
+        """
+        Refresh many FRED series concurrently. Series that are up to date are not requested.
+
+        :param series: Keys of macro_scraper.fred_series or FRED series ids. None for every key of fred_series.
+        :param max_workers: Series fetched at the same time.
+        :return: Series that were updated.
+        """
+        series = list(fred_series) if series is None else series
+        updated = self.macro_scraper.update_many(
+            {name: self.get_macro_path(name) for name in series},
+            max_workers=max_workers,
+        )
+        values = {
+            name: parse_macro_frame(
+                pd.read_csv(self.get_macro_path(name)), self.get_macro_column(name)
+            )
+            for name in updated
+        }
+        # One write of the macro panel for the whole batch.
+        self.macro_store.write_many(values)
+        for name in updated:
+            self.record_macro(name, values[name])
+        return updated
+
+    def get_macro_panel(self, series: list = None) -> pd.DataFrame:
+        """
+        Every macro series as float64 columns on one monthly "Date" index, loaded in a single read.
+        Series with a csv file that are not in the panel yet are imported first.
+
+        :param series: Series to return. Ex: ["cpi", "fed_funds"]. None returns every stored series.
+        :return: DataFrame indexed by the first day of each month. Months without an observation are NaN.
+        """
+        self.import_macro_csvs(overwrite=False)
+        panel = self.macro_store.read_panel()
+        if series is not None:
+            missing = [name for name in series if name not in panel.columns]
+            if missing:
+                print(f"[Warning] Macro series not stored: {missing}")
+            panel = panel[[name for name in series if name in panel.columns]]
+        return panel
+
+    def store_macro_series(self, series: str, data: pd.DataFrame) -> None:
+        """
+        Write a macro frame in the csv layout to the macro panel.
+        """
+        values = parse_macro_frame(data, self.get_macro_column(series))
+        self.macro_store.write_series(series, values)
+        self.record_macro(series, values)
+
+    def record_macro(self, series: str, values: pd.Series) -> None:
+        self.catalog.record_frame(
+            "macro",
+            series,
+            values.to_frame(),
+            values.index[-1] if len(values) else None,
+        )
+
+    def import_macro_csvs(self, overwrite: bool = True) -> list:
+        """
+        Copy the macro csv files into the macro panel.
+
+        :param overwrite: If False, only series missing from the panel, or whose csv changed after the panel was
+                          written, are imported.
+        :return: The imported series.
+        """
+        stored = self.macro_store.get_series_names()
+        panel_time = (
+            os.path.getmtime(self.macro_store.panel_file)
+            if self.macro_store.exists()
+            else 0
+        )
+        known = ["cpi"] + list(fred_series)
+        values = {}
+        for series in known + [name for name in stored if name not in known]:
+            file_path = self.get_macro_path(series)
+            if not os.path.exists(file_path):
+                continue
+            if (
+                not overwrite
+                and series in stored
+                and os.path.getmtime(file_path) <= panel_time
+            ):
+                continue
+            try:
+                data = pd.read_csv(file_path)
+            except EmptyDataError:
+                continue
+            values[series] = parse_macro_frame(data, self.get_macro_column(series))
+        # One write of the macro panel for every imported series.
+        self.macro_store.write_many(values)
+        for series, series_values in values.items():
+            self.record_macro(series, series_values)
+        return list(values)
+
+    def get_macro_on_dates(
+        self, dates, series: list = None, lags: dict = None
+    ) -> pd.DataFrame:
+        """
+        Point-in-time macro values: each date gets the latest value that was published on or before it.
+
+        :param dates: Ex: the index of a price frame, or of a dates x tickers matrix. The result can be reused for
+                      every ticker on the same dates.
+        :param series: Macro series. None for every stored series.
+        :param lags: Series -> days between the first day of the month and its release. See macro_store.release_lags.
+        :return: Dates x series frame.
+        """
+        known = release_panel(self.get_macro_panel(series), lags)
+        return pd.DataFrame(
+            align_to_dates(known, dates),
+            index=pd.DatetimeIndex(dates, name="Date"),
+            columns=known.columns,
+        )
+
+    def join_macro(self, data, series: list = None, lags: dict = None):
+        """
+        Add the point-in-time macro columns to price frames. See get_macro_on_dates.
+
+        :param data: Frame indexed by date (Ex: from get_data), or a dictionary of ticker -> frame (Ex: from get_data_many).
+        :return: The same shape as "data", with one column per macro series.
+        """
+        if isinstance(data, pd.DataFrame):
+            macro = self.get_macro_on_dates(data.index, series=series, lags=lags)
+            return data.assign(
+                **{name: macro[name].to_numpy() for name in macro.columns}
+            )
+
+        # Align once on the union of every ticker's dates, then look up each ticker's rows in the aligned array.
+        calendar = pd.DatetimeIndex(
+            np.unique(np.concatenate([df.index.to_numpy() for df in data.values()]))
+            if data
+            else []
+        )
+        macro = self.get_macro_on_dates(calendar, series=series, lags=lags)
+        aligned = macro.to_numpy()
+        joined = {}
+        for ticker, df in data.items():
+            rows = calendar.get_indexer(df.index)
+            joined[ticker] = df.assign(
+                **{name: aligned[rows, i] for i, name in enumerate(macro.columns)}
+            )
+        return joined
+
     ##################################################################### Financial Statements #####################################################################
+    @cached_frame(
+        "statements",
+        path=lambda self, ticker, freq, **kwargs: self.get_statement_path(
+            ticker, freq, "income_statement"
+        ),
+    )
     def get_income_statement(
         self,
         ticker: str,
@@ -325,7 +899,7 @@ class DataManager:
             freq = "Quarter"
         elif freq == "a":
             freq = "Annual"
-        file_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}\\{ticker.upper()}_income_statement.csv"
+        file_path = self.get_statement_path(ticker, freq, "income_statement")
         # Force new data to be written locally regardless of data's staleness.
         if force_update:
             try:
@@ -335,15 +909,25 @@ class DataManager:
                     data.index.rename("index", inplace=True)
                 except KeyError:
                     pass
-                new_data = self.equity_scraper.get_income_statement(ticker, freq)
-                result_data = pd.concat([data, new_data], axis=1, join="inner")
+                new_data = self.fetch_statement(
+                    ticker, freq, "income_statement", write_data
+                )
+                result_data = self.merge_statement(file_path, new_data)
                 if write_data:
-                    result_data.to_csv(file_path)
+                    self.write_statement(
+                        result_data, file_path, ticker, freq, "income_statement"
+                    )
                 return result_data
             except FileNotFoundError:
-                data = self.equity_scraper.get_income_statement(ticker, freq)
+                data = self.fetch_statement(
+                    ticker, freq, "income_statement", write_data
+                )
+                if data is None:
+                    return None
                 if write_data:
-                    data.to_csv(file_path)
+                    self.write_statement(
+                        data, file_path, ticker, freq, "income_statement"
+                    )
                 return data
         # If no force update, then get the statement regularly.
         else:
@@ -358,26 +942,44 @@ class DataManager:
                 if self.is_outdated(
                     most_recent_filing, self.expired
                 ):  # Check if most recent filing is outdated.
-                    new_data = self.equity_scraper.get_income_statement(ticker, freq)
-                    result_data = pd.concat([data, new_data], axis=1, join="inner")
+                    new_data = self.fetch_statement(
+                        ticker, freq, "income_statement", write_data
+                    )
+                    result_data = self.merge_statement(file_path, new_data)
                     if write_data:
-                        result_data.to_csv(file_path)
+                        self.write_statement(
+                            result_data, file_path, ticker, freq, "income_statement"
+                        )
                     return result_data
                 else:
                     return data
 
             except FileNotFoundError:
-                data = self.equity_scraper.get_income_statement(ticker.upper(), freq)
+                data = self.fetch_statement(
+                    ticker.upper(), freq, "income_statement", write_data
+                )
+                if data is None:
+                    return None
                 try:
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(
+                            data, file_path, ticker, freq, "income_statement"
+                        )
                 except OSError:
                     folder_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}"
                     os.makedirs(folder_path, exist_ok=True)
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(
+                            data, file_path, ticker, freq, "income_statement"
+                        )
                 return data
 
+    @cached_frame(
+        "statements",
+        path=lambda self, ticker, freq, **kwargs: self.get_statement_path(
+            ticker, freq, "balance_sheet"
+        ),
+    )
     def get_balance_sheet(
         self,
         ticker: str,
@@ -389,7 +991,7 @@ class DataManager:
             freq = "Quarter"
         elif freq == "a":
             freq = "Annual"
-        file_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}\\{ticker.upper()}_balance_sheet.csv"
+        file_path = self.get_statement_path(ticker, freq, "balance_sheet")
         if force_update:
             try:
                 data = pd.read_csv(file_path)
@@ -398,15 +1000,21 @@ class DataManager:
                     data.index.rename("index", inplace=True)
                 except KeyError:
                     pass
-                new_data = self.equity_scraper.get_balance_sheet(ticker, freq)
-                result_data = pd.concat([data, new_data], axis=1, join="inner")
+                new_data = self.fetch_statement(
+                    ticker, freq, "balance_sheet", write_data
+                )
+                result_data = self.merge_statement(file_path, new_data)
                 if write_data:
-                    result_data.to_csv(file_path)
+                    self.write_statement(
+                        result_data, file_path, ticker, freq, "balance_sheet"
+                    )
                 return result_data
             except FileNotFoundError:
-                data = self.equity_scraper.get_balance_sheet(ticker, freq)
+                data = self.fetch_statement(ticker, freq, "balance_sheet", write_data)
+                if data is None:
+                    return None
                 if write_data:
-                    data.to_csv(file_path)
+                    self.write_statement(data, file_path, ticker, freq, "balance_sheet")
                 return data
         # If no force update, then get the statement regularly.
         else:
@@ -421,25 +1029,43 @@ class DataManager:
                 if self.is_outdated(
                     most_recent_filing, self.expired
                 ):  # Check if most recent filing is outdated.
-                    new_data = self.equity_scraper.get_balance_sheet(ticker, freq)
-                    result_data = pd.concat([data, new_data], axis=1, join="inner")
+                    new_data = self.fetch_statement(
+                        ticker, freq, "balance_sheet", write_data
+                    )
+                    result_data = self.merge_statement(file_path, new_data)
                     if write_data:
-                        result_data.to_csv(file_path)
+                        self.write_statement(
+                            result_data, file_path, ticker, freq, "balance_sheet"
+                        )
                     return result_data
                 else:
                     return data
             except FileNotFoundError:
-                data = self.equity_scraper.get_balance_sheet(ticker.upper(), freq)
+                data = self.fetch_statement(
+                    ticker.upper(), freq, "balance_sheet", write_data
+                )
+                if data is None:
+                    return None
                 try:
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(
+                            data, file_path, ticker, freq, "balance_sheet"
+                        )
                 except OSError:
                     folder_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}"
                     os.makedirs(folder_path, exist_ok=True)
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(
+                            data, file_path, ticker, freq, "balance_sheet"
+                        )
                 return data
 
+    @cached_frame(
+        "statements",
+        path=lambda self, ticker, freq, **kwargs: self.get_statement_path(
+            ticker, freq, "cash_flow"
+        ),
+    )
     def get_cash_flow(
         self,
         ticker: str,
@@ -451,7 +1077,7 @@ class DataManager:
             freq = "Quarter"
         elif freq == "a":
             freq = "Annual"
-        file_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}\\{ticker.upper()}_cash_flow.csv"
+        file_path = self.get_statement_path(ticker, freq, "cash_flow")
 
         if force_update:
             try:
@@ -461,15 +1087,19 @@ class DataManager:
                     data.index.rename("index", inplace=True)
                 except KeyError:
                     pass
-                new_data = self.equity_scraper.get_cash_flow(ticker, freq)
-                result_data = pd.concat([data, new_data], axis=1, join="inner")
+                new_data = self.fetch_statement(ticker, freq, "cash_flow", write_data)
+                result_data = self.merge_statement(file_path, new_data)
                 if write_data:
-                    result_data.to_csv(file_path)
+                    self.write_statement(
+                        result_data, file_path, ticker, freq, "cash_flow"
+                    )
                 return result_data
             except FileNotFoundError:
-                data = self.equity_scraper.get_cash_flow(ticker, freq)
+                data = self.fetch_statement(ticker, freq, "cash_flow", write_data)
+                if data is None:
+                    return None
                 if write_data:
-                    data.to_csv(file_path)
+                    self.write_statement(data, file_path, ticker, freq, "cash_flow")
                 return data
         # If no force update, then get the statement regularly.
         else:
@@ -484,25 +1114,114 @@ class DataManager:
                 if self.is_outdated(
                     most_recent_filing, self.expired
                 ):  # Check if most recent filing is outdated.
-                    new_data = self.equity_scraper.get_cash_flow(ticker, freq)
-                    result_data = pd.concat([data, new_data], axis=1, join="inner")
+                    new_data = self.fetch_statement(
+                        ticker, freq, "cash_flow", write_data
+                    )
+                    result_data = self.merge_statement(file_path, new_data)
                     if write_data:
-                        result_data.to_csv(file_path)
+                        self.write_statement(
+                            result_data, file_path, ticker, freq, "cash_flow"
+                        )
                     return result_data
                 else:
                     return data
             except FileNotFoundError:
-                data = self.equity_scraper.get_cash_flow(ticker.upper(), freq)
+                data = self.fetch_statement(
+                    ticker.upper(), freq, "cash_flow", write_data
+                )
+                if data is None:
+                    return None
                 try:
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(data, file_path, ticker, freq, "cash_flow")
                 except OSError:
                     folder_path = f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}"
                     os.makedirs(folder_path, exist_ok=True)
                     if write_data:
-                        data.to_csv(file_path)
+                        self.write_statement(data, file_path, ticker, freq, "cash_flow")
                 return data
 
+    def fetch_statement(
+        self, ticker: str, freq: str, statement: str, write_data: bool = True
+    ) -> pd.DataFrame:
+        """
+        Fetch a statement from Alpha Vantage, or from the SEC XBRL facts if "statement_source" is "sec".
+        Both sources return the quarterly and annual reports together,
+        so the frequency that was not requested is saved locally as well. Later calls for it are read from disk.
+
+        :param freq: "q", "a", "Quarter" or "Annual".
+        :param statement: "income_statement", "balance_sheet" or "cash_flow".
+        :return: The report for the requested frequency.
+        """
+        if self.statement_source == "sec":
+            reports = self.sec_scraper.get_statement_reports(ticker, statement)
+        else:
+            reports = self.equity_scraper.get_statement_reports(ticker, statement)
+        if reports is None:
+            return None
+        requested = "quarterly" if freq in ["q", "Quarter"] else "annual"
+        if write_data:
+            for report_freq, df in reports.items():
+                # The requested frequency is written by the caller.
+                if report_freq == requested:
+                    continue
+                folder = "Quarter" if report_freq == "quarterly" else "Annual"
+                file_path = self.get_statement_path(ticker, folder, statement)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                df = self.merge_statement(file_path, df)
+                self.write_statement(df, file_path, ticker, folder, statement)
+        return reports[requested]
+
+    def merge_statement(self, file_path: str, new_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merge new reports into the statement stored at "file_path". The API only returns recent reports, so the
+        older columns of the stored file are kept. Reports in both are taken from "new_data".
+
+        :return: The merged statement, oldest report first.
+        """
+        if new_data is None:
+            # Nothing was fetched, so the stored statement is kept as it is.
+            return pd.read_csv(file_path, index_col=0)
+        try:
+            data = pd.read_csv(file_path, index_col=0)
+        except (FileNotFoundError, EmptyDataError):
+            return new_data
+        data.index.rename(new_data.index.name, inplace=True)
+        data = data.drop(columns=[c for c in new_data.columns if c in data.columns])
+        result_data = pd.concat([data, new_data], axis=1, join="inner")
+        return result_data[sorted(result_data.columns)]
+
+    def write_statement(
+        self, data: pd.DataFrame, file_path: str, ticker: str, freq: str, statement: str
+    ) -> None:
+        """
+        Write a statement csv and record it in the catalog as "{statement}_{freq}".
+
+        :param freq: "Quarter" or "Annual".
+        """
+        # The most recent filing is the last column.
+        last_filing = data.columns[-1] if len(data.columns) else None
+        self.write_csv(data, file_path, f"{statement}_{freq}", ticker, last_filing)
+
+    def write_csv(
+        self,
+        df: pd.DataFrame,
+        file_path: str,
+        dataset: str,
+        ticker: str,
+        last_observation=None,
+        **kwargs,
+    ) -> None:
+        """
+        Write a csv file and record it in the catalog.
+
+        :param dataset: Dataset of the catalog. Ex: "filings"
+        :param last_observation: Date of the newest row, if the file is a time series.
+        :param kwargs: Passed to DataFrame.to_csv.
+        """
+        df.to_csv(file_path, **kwargs)
+        self.catalog.record_frame(dataset, ticker, df, last_observation)
+
     def get_stock_split(self, ticker: str, force_update: bool = False):
         ticker = ticker.upper()
         file_path = f"{self.equities_folder}\\Stocks\\{ticker}\\Splits"
@@ -510,7 +1229,13 @@ class DataManager:
         if force_update or not os.path.exists(f"{file_path}\\{ticker}_splits.csv"):
             os.makedirs(file_path, exist_ok=True)
             df = si.get_splits(ticker).T
-            df.to_csv(f"{file_path}\\{ticker}_splits.csv", index=False)
+            self.write_csv(
+                df,
+                f"{file_path}\\{ticker}_splits.csv",
+                "splits",
+                ticker,
+                index=False,
+            )
         else:
             df = pd.read_csv(f"{file_path}\\{ticker}_splits.csv")
             try:
@@ -562,21 +1287,22 @@ class DataManager:
                 pass
         except FileNotFoundError:
             df = self.etf_scraper.get_filtered_data(market)
-            df.to_csv(file_path)
+            self.write_csv(df, file_path, "etfs", market)
 
         return df
 
     ##################################################################### Utilities #####################################################################
     def is_outdated(self, date, day_threshold: int = 70):
+        # Dates read from the price store are already datetime objects.
+        if isinstance(date, (dt.datetime, dt.date)):
+            date = date.strftime("%Y-%m-%d")
 
-        has_days = dt.datetime.strptime(date, "%Y-%m-%d").day is not None
+        # Monthly macro series are stored without days. Ex: 2023-9
+        has_days = date.count("-") == 2
 
         # If the date passed *does not* have days. %Y-%m
         if not has_days:
-            # Ensure month has a leading zero
-            date_str_padded = dt.datetime.strptime(date, "%Y-%m").strftime("%Y-%m")
-            # Convert to datetime object
-            date_object = dt.datetime.strptime(date_str_padded, "%Y-%m")
+            date_object = dt.datetime.strptime(date, "%Y-%m")
         # If the date passed *does* have days. %Y-%m-%d
         else:
             date_object = dt.datetime.strptime(date, "%Y-%m-%d")
@@ -590,6 +1316,45 @@ class DataManager:
         else:
             return False
 
+    def get_statement_path(self, ticker: str, freq: str, statement: str) -> str:
+        """
+        :param freq: "q", "a", "Quarter" or "Annual".
+        :param statement: "income_statement", "balance_sheet" or "cash_flow".
+        """
+        if freq == "q":
+            freq = "Quarter"
+        elif freq == "a":
+            freq = "Annual"
+        return f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\Statements\\{freq}\\{ticker.upper()}_{statement}.csv"
+
+    def get_earnings_path(self, ticker: str) -> str:
+        return f"{self.equities_folder}\\Stocks\\{ticker.upper()}\\{ticker.upper()}_earnings.csv"
+
+    def get_filings_path(self) -> str:
+        return f"{self.equities_folder}\\Filings\\quarterly_filings.csv"
+
+    def get_macro_path(self, series: str) -> str:
+        """
+        :param series: "cpi", "fed_funds", "treasury_yield_spread" or a key of macro_scraper.fred_series.
+        """
+        macro_files = {
+            "cpi": "CPI\\cpi.csv",
+            "fed_funds": "FedFunds\\fed_funds.csv",
+            "treasury_yield_spread": "Treasury_Yield_Spread_10Y_2Y\\Treasury_Yield_Spread_10Y_2Y.csv",
+        }
+        # Series added to macro_scraper.fred_series are stored as {series}\{series}.csv
+        if series not in macro_files:
+            return os.path.join(self.macro_folder, series, f"{series}.csv")
+        return f"{self.macro_folder}\\{macro_files[series]}"
+
+    def get_macro_column(self, series: str) -> str:
+        """
+        :return: Value column of the series' csv file.
+        """
+        if series == "cpi":
+            return "CPI_val"
+        return get_series_config(series)["column"]
+
     def setup_local_equity_files(self, ticker: str):
         ticker = ticker.upper()
 
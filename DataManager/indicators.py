@@ -0,0 +1,103 @@
+# Vectorized technical indicators.
+# Every function accepts a Series for a single ticker, or a dates x tickers DataFrame to calculate the whole universe in one call.
+
+# Numpy & Pandas
+import numpy as np
+import pandas as pd
+
+
+def wilder_smooth(values, period: int):
+    """
+    Wilder's moving average. The first value is the simple average of the first "period" values,
+    every value after that is: prev + (value - prev) / period.
+
+    :param values: Series or DataFrame. Leading NaN values (Ex: tickers that started trading later) are skipped per column.
+    """
+    seed = values.rolling(window=period, min_periods=period).mean()
+    valid_count = seed.notna().cumsum()
+    # Only the first complete window is used as the seed, the rest comes from the recursive average.
+    smoothed_input = values.where(valid_count > 1)
+    smoothed_input = smoothed_input.mask(valid_count == 1, seed)
+    return smoothed_input.ewm(alpha=1 / period, adjust=False, ignore_na=True).mean()
+
+
+def rsi(close, period: int = 14):
+    """
+    :param close: Series or dates x tickers DataFrame of closing prices.
+    :param period: Number of periods used for Wilder's smoothing.
+    :return: RSI with the same shape as "close".
+    """
+    # Changes are measured from the previous valid close, so gaps in a dates x tickers frame are skipped.
+    delta = close.ffill().diff().where(close.notna())
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    avg_gain = wilder_smooth(gain, period)
+    avg_loss = wilder_smooth(loss, period)
+    # A period with no losses gives an infinite RS, and an RSI of 100.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def macd(
+    close, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9
+) -> dict:
+    """
+    :param close: Series or dates x tickers DataFrame of closing prices.
+    :return: Dictionary with the "MACD", "Signal_Line" and "MACD_Histogram" values.
+    """
+    fast_ema = close.ewm(span=fast_period, adjust=False, ignore_na=True).mean()
+    slow_ema = close.ewm(span=slow_period, adjust=False, ignore_na=True).mean()
+    macd_line = (fast_ema - slow_ema).where(close.notna())
+    signal_line = macd_line.ewm(span=signal_period, adjust=False, ignore_na=True).mean()
+    signal_line = signal_line.where(close.notna())
+    return {
+        "MACD": macd_line,
+        "Signal_Line": signal_line,
+        "MACD_Histogram": macd_line - signal_line,
+    }
+
+
+def fib_retracement(high, low, levels: tuple = (0.382, 0.5, 0.618)) -> dict:
+    """
+    :param high: Series or dates x tickers DataFrame of high prices.
+    :param low: Same shape as "high".
+    :return: Dictionary of column name -> retracement level. Ex: "Retracement_38.2"
+    """
+    price_range = high - low
+    retracements = {}
+    for level in levels:
+        label = f"{level * 100:g}"
+        retracements[f"Retracement_{label}"] = high - level * price_range
+    return retracements
+
+
+def calc_all(
+    close,
+    adj_close=None,
+    rsi_period: int = 14,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+) -> dict:
+    """
+    Calculate every indicator stored by the DataManager.
+
+    :param close: Series or dates x tickers DataFrame of closing prices.
+    :param adj_close: Adjusted closing prices used for "Close_Pct_Change". Defaults to "close".
+    :return: Dictionary of column name -> indicator, each with the same shape as "close".
+    """
+    if adj_close is None:
+        adj_close = close
+    pct_change = adj_close.ffill().pct_change(fill_method=None) * 100
+    indicators = {"Close_Pct_Change": pct_change.where(adj_close.notna())}
+    indicators["RSI"] = rsi(close, period=rsi_period)
+    indicators.update(
+        macd(
+            close,
+            fast_period=fast_period,
+            slow_period=slow_period,
+            signal_period=signal_period,
+        )
+    )
+    return indicators
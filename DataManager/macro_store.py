@@ -0,0 +1,192 @@
+# Operating system imports
+import os
+
+# Numpy & Pandas
+import numpy as np
+import pandas as pd
+
+# Columnar storage. Optional, the panel is pickled when pyarrow is not installed.
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Days between the first day of an observed month and the day its value is published.
+# Ex: CPI for September is released around October 12th, so it is only used from October 16th on.
+release_lags = {"cpi": 45, "fed_funds": 32, "treasury_yield_spread": 32}
+# Used for series without an entry in "release_lags". Monthly averages are known once the month is over.
+default_release_lag = 32
+
+
+def to_monthly(values: pd.Series) -> pd.Series:
+    """
+    :param values: Series indexed by dates. Several values in the same month keep the last one.
+    :return: float64 series indexed by the first day of each month.
+    """
+    values = pd.to_numeric(values, errors="coerce").astype("float64")
+    index = pd.DatetimeIndex(values.index).to_period("M").to_timestamp()
+    values = pd.Series(values.to_numpy(), index=index, name=values.name)
+    values = values.groupby(level=0).last().sort_index()
+    values.index.name = "Date"
+    return values
+
+
+def parse_macro_frame(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Read a macro frame in the csv layout. Ex: Date "2023-9", CPI_val "3.7%" or "N\\A".
+
+    :param column: Name of the value column.
+    :return: Monthly float64 series. Values that are not numbers are dropped.
+    """
+    dates = pd.to_datetime(df["Date"].astype(str), format="mixed", errors="coerce")
+    values = df[column]
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.rstrip("%")
+    values = pd.Series(
+        pd.to_numeric(values, errors="coerce").to_numpy(), index=dates, name=column
+    )
+    values = values[values.index.notna()].dropna()
+    return to_monthly(values)
+
+
+def release_panel(panel: pd.DataFrame, lags: dict = None) -> pd.DataFrame:
+    """
+    Re-index the macro panel by the date each value became public, so it can be joined without look-ahead.
+
+    :param panel: Monthly panel. See MacroStore.read_panel.
+    :param lags: Series -> days after the first day of the month. Overrides "release_lags".
+    :return: DataFrame indexed by release date. Every row holds the latest value known on that date.
+    """
+    lags = {**release_lags, **(lags or {})}
+    columns = []
+    for name in panel.columns:
+        values = panel[name].dropna()
+        lag = pd.Timedelta(days=lags.get(name, default_release_lag))
+        columns.append(
+            pd.Series(values.to_numpy(), index=values.index + lag, name=name)
+        )
+    if not columns:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+    known = pd.concat(columns, axis=1).sort_index().ffill()
+    known.index.name = "Date"
+    return known
+
+
+def align_to_dates(known: pd.DataFrame, dates) -> np.ndarray:
+    """
+    As-of lookup of every date in one pass. Same result as a backward merge_asof, without building a frame per date.
+
+    :param known: Output of release_panel.
+    :param dates: Sorted or unsorted dates. Ex: the index of a price frame.
+    :return: float64 array of shape (len(dates), number of series). NaN before a series' first release.
+    """
+    release_dates = known.index.to_numpy().astype("datetime64[ns]")
+    dates = np.asarray(
+        pd.DatetimeIndex(dates).tz_localize(None), dtype="datetime64[ns]"
+    )
+    rows = np.searchsorted(release_dates, dates, side="right") - 1
+    values = known.to_numpy(dtype="float64")
+    if len(values) == 0:
+        return np.full((len(dates), known.shape[1]), np.nan)
+    aligned = values[np.clip(rows, 0, None)]
+    aligned[rows < 0] = np.nan
+    return aligned
+
+
+class MacroStore:
+    """
+    Every macro series in one panel: a monthly "Date" index (first day of the month) and one float64 column per series.
+    The panel is a single binary file, so all series are loaded aligned in one read.
+    """
+
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path = folder_path
+        extension = "parquet" if pq is not None else "pkl"
+        self.panel_file = os.path.join(self.folder_path, f"macro_panel.{extension}")
+
+    """-------------------------------"""
+
+    def exists(self) -> bool:
+        return os.path.exists(self.panel_file)
+
+    """-------------------------------"""
+
+    def get_series_names(self) -> list:
+        """
+        :return: Names of the stored series. Only the file's metadata is read when pyarrow is installed.
+        """
+        if not self.exists():
+            return []
+        if pq is not None:
+            return [
+                name for name in pq.read_schema(self.panel_file).names if name != "Date"
+            ]
+        return list(self.read_panel().columns)
+
+    """-------------------------------"""
+
+    def read_panel(self, series: list = None) -> pd.DataFrame:
+        """
+        :param series: Columns to read. None reads every series.
+        :return: The panel. Empty if nothing was stored yet.
+        """
+        if not self.exists():
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        if pq is not None:
+            panel = pd.read_parquet(self.panel_file, columns=series)
+        else:
+            panel = pd.read_pickle(self.panel_file)
+            if series is not None:
+                panel = panel[series]
+        return panel
+
+    """-------------------------------"""
+
+    def read_series(self, name: str) -> pd.Series:
+        """
+        :return: The series without the months before its first or after its last observation. None if not stored.
+        """
+        panel = self.read_panel()
+        if name not in panel.columns:
+            return None
+        values = panel[name]
+        return values.loc[values.first_valid_index() : values.last_valid_index()]
+
+    """-------------------------------"""
+
+    def write_series(self, name: str, values: pd.Series) -> None:
+        """
+        Replace a series in the panel. The index of the panel grows to cover every series.
+
+        :param values: Monthly series. See to_monthly.
+        """
+        self.write_many({name: values})
+
+    """-------------------------------"""
+
+    def write_many(self, series: dict) -> None:
+        """
+        Replace several series with a single rewrite of the panel.
+
+        :param series: Name -> values. See write_series.
+        """
+        if not series:
+            return
+        panel = self.read_panel()
+        panel = panel.drop(columns=list(series), errors="ignore")
+        for name, values in series.items():
+            panel = panel.join(to_monthly(values).rename(name), how="outer")
+        panel.index.name = "Date"
+        self.write_panel(panel.sort_index())
+
+    """-------------------------------"""
+
+    def write_panel(self, panel: pd.DataFrame) -> None:
+        os.makedirs(self.folder_path, exist_ok=True)
+        # Written to a temporary file first, so readers never see a partial panel.
+        temp_file = f"{self.panel_file}.tmp"
+        if pq is not None:
+            panel.to_parquet(temp_file, compression="zstd")
+        else:
+            panel.to_pickle(temp_file)
+        os.replace(temp_file, self.panel_file)
@@ -0,0 +1,249 @@
+# Operating system imports
+import os
+
+# Pandas
+import pandas as pd
+
+# Columnar storage. Optional, the csv backend is used when pyarrow is not installed.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Columns persisted for every ticker. Anything else the caller adds is kept as well, but these are typed explicitly.
+price_columns = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+indicator_columns = [
+    "Close_Pct_Change",
+    "RSI",
+    "MACD",
+    "Signal_Line",
+    "MACD_Histogram",
+]
+
+
+class PriceStore:
+    """
+    Base class for the storage backends used by the DataManager for daily price history.
+    Every backend stores one frame per ticker, indexed by a "Date" datetime64 index.
+    """
+
+    extension = ""
+
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path = folder_path
+
+    """-------------------------------"""
+
+    def read(self, ticker: str) -> pd.DataFrame:
+        """
+        :param ticker: Ticker of a company.
+        :return: The stored frame, or None if the ticker has no local data.
+        """
+        raise NotImplementedError
+
+    """-------------------------------"""
+
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        """
+        :param ticker: Ticker of a company.
+        :param df: Frame to store. The previous frame for the ticker is replaced.
+        """
+        raise NotImplementedError
+
+    """-------------------------------"""
+
+    def get_path(self, ticker: str) -> str:
+        raise NotImplementedError
+
+    """-------------------------------"""
+
+    def exists(self, ticker: str) -> bool:
+        return os.path.exists(self.get_path(ticker))
+
+    """-------------------------------"""
+
+    def list_tickers(self) -> list:
+        raise NotImplementedError
+
+    """-------------------------------"""
+
+    def read_many(self, tickers: list) -> dict:
+        """
+        :param tickers: List of tickers to load.
+        :return: Dictionary of ticker -> frame. Tickers without local data are left out.
+        """
+        frames = {}
+        for ticker in tickers:
+            df = self.read(ticker)
+            if df is not None:
+                frames[ticker.upper()] = df
+        return frames
+
+    """-------------------------------"""
+
+    def format_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give the frame a sorted datetime64 "Date" index and numeric columns.
+        """
+        if "Date" in df.columns:
+            df = df.set_index("Date")
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index)
+        # Drop timezone information, yfinance occasionally returns localized indexes.
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        df.index.name = "Date"
+        for col in price_columns + indicator_columns:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        return df
+
+
+class CsvPriceStore(PriceStore):
+    """
+    Legacy layout. One csv file per ticker inside of the ticker's folder: Stocks\\{ticker}\\{ticker}_prices.csv
+    """
+
+    extension = ".csv"
+
+    def get_path(self, ticker: str) -> str:
+        ticker = ticker.upper()
+        return os.path.join(self.folder_path, ticker, f"{ticker}_prices.csv")
+
+    """-------------------------------"""
+
+    def read(self, ticker: str) -> pd.DataFrame:
+        try:
+            df = pd.read_csv(self.get_path(ticker), index_col="Date", parse_dates=True)
+        except FileNotFoundError:
+            return None
+        return self.format_frame(df)
+
+    """-------------------------------"""
+
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        path = self.get_path(ticker)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path)
+
+    """-------------------------------"""
+
+    def list_tickers(self) -> list:
+        if not os.path.isdir(self.folder_path):
+            return []
+        return sorted(
+            folder
+            for folder in os.listdir(self.folder_path)
+            if os.path.exists(self.get_path(folder))
+        )
+
+
+class ParquetPriceStore(PriceStore):
+    """
+    Columnar layout. All tickers share a single flat folder: Prices\\{ticker}.parquet
+    Files are compressed, and the "Date" index is stored as a typed timestamp so no date parsing is needed on reads.
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, folder_path: str, compression: str = "zstd") -> None:
+        if pq is None:
+            raise ImportError("pyarrow is required for the parquet price store.")
+        super().__init__(folder_path)
+        self.compression = compression
+        os.makedirs(self.folder_path, exist_ok=True)
+
+    """-------------------------------"""
+
+    def get_path(self, ticker: str) -> str:
+        return os.path.join(self.folder_path, f"{ticker.upper()}{self.extension}")
+
+    """-------------------------------"""
+
+    def read(self, ticker: str, columns: list = None) -> pd.DataFrame:
+        """
+        :param ticker: Ticker of a company.
+        :param columns: Optional subset of columns to read. Other columns are never decoded.
+        :return: The stored frame, or None if the ticker has no local data.
+        """
+        path = self.get_path(ticker)
+        if not os.path.exists(path):
+            return None
+        if columns is not None:
+            columns = list(columns) + ["Date"]
+        table = pq.read_table(path, columns=columns)
+        return table.to_pandas()
+
+    """-------------------------------"""
+
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        df = self.format_frame(df.copy())
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        path = self.get_path(ticker)
+        # Write to a temporary file first, so an interrupted write never leaves a corrupt file behind.
+        temp_path = f"{path}.tmp"
+        pq.write_table(table, temp_path, compression=self.compression)
+        os.replace(temp_path, path)
+
+    """-------------------------------"""
+
+    def list_tickers(self) -> list:
+        return sorted(
+            file_name[: -len(self.extension)]
+            for file_name in os.listdir(self.folder_path)
+            if file_name.endswith(self.extension)
+        )
+
+    """-------------------------------"""
+
+    def import_csv_tree(
+        self,
+        csv_store: CsvPriceStore,
+        overwrite: bool = False,
+        log_data: bool = True,
+        write=None,
+    ) -> list:
+        """
+        Convert the legacy csv tree into the parquet store.
+
+        :param csv_store: Store pointing at the existing "Stocks" folder.
+        :param overwrite: If False, tickers that already exist in the parquet store are skipped.
+        :param write: Function called with (ticker, frame) to store each ticker. Defaults to self.write.
+        :return: List of the tickers that were imported.
+        """
+        write = self.write if write is None else write
+        imported = []
+        for ticker in csv_store.list_tickers():
+            if not overwrite and self.exists(ticker):
+                continue
+            df = csv_store.read(ticker)
+            if df is None or df.empty:
+                continue
+            write(ticker, df)
+            imported.append(ticker)
+            if log_data:
+                print(f"[Imported] {ticker}")
+        return imported
+
+
+def create_price_store(backend: str, equities_folder: str) -> PriceStore:
+    """
+    :param backend: "parquet" or "csv".
+    :param equities_folder: Path to the "EquityData" folder.
+    :return: The price store for the backend. Falls back to csv if pyarrow is not installed.
+    """
+    csv_store = CsvPriceStore(os.path.join(equities_folder, "Stocks"))
+    if backend == "csv":
+        return csv_store
+    elif backend == "parquet":
+        if pq is None:
+            print("[Warning] pyarrow is not installed. Using the csv price store.")
+            return csv_store
+        return ParquetPriceStore(os.path.join(equities_folder, "Prices"))
+    else:
+        raise ValueError(f"Unknown price store backend: {backend}")
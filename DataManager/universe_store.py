@@ -0,0 +1,289 @@
+# Operating system imports
+import os
+import json
+import shutil
+import time
+
+# Numpy & Pandas
+import numpy as np
+import pandas as pd
+
+default_fields = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class UniverseStore:
+    """
+    Memory-mapped store holding the price history of every ticker in one place.
+
+    Every build is written to its own version folder, and "current.txt" holds the name of the version in use.
+    Views returned by a previous open() keep their files mapped, and Windows cannot delete mapped files, so old
+    versions are removed by later builds once nothing maps them anymore.
+
+    Layout of a version folder:
+        {field}.bin     One contiguous float64 array per field. The rows of each ticker are stored back to back.
+        dates.bin       int32 array with the position of every row in the shared calendar.
+        calendar.npy    Sorted datetime64[D] array with every date found in the universe.
+        offsets.npy     int64 array. The rows of the i-th ticker are offsets[i]:offsets[i + 1].
+        meta.json       Tickers, fields and the total number of rows.
+
+    Reads go through np.memmap, so only the pages that are touched are loaded into memory.
+    """
+
+    def __init__(self, folder_path: str) -> None:
+        self.folder_path = folder_path
+        self.pointer_file = os.path.join(self.folder_path, "current.txt")
+        # Version folder that is currently open.
+        self.data_path = None
+        self.tickers = []
+        self.ticker_index = {}
+        self.fields = {}
+        self.calendar = None
+        self.offsets = None
+        self.dates = None
+        self.is_open = False
+
+    """-------------------------------"""
+
+    def build(
+        self, price_store, tickers: list = None, fields: list = None, log_data=False
+    ) -> None:
+        """
+        Rebuild the store from a price store. Tickers are read one at a time, so memory use does not grow with the universe.
+
+        :param price_store: PriceStore to read the frames from.
+        :param tickers: Tickers to include. Defaults to every ticker in the price store.
+        :param fields: Columns to store. Defaults to OHLCV.
+        """
+        if tickers is None:
+            tickers = price_store.list_tickers()
+        if fields is None:
+            fields = default_fields
+        self.close()
+
+        version = f"v{time.time_ns()}"
+        temp_folder = os.path.join(self.folder_path, version)
+        os.makedirs(temp_folder)
+
+        field_files = {
+            field: open(os.path.join(temp_folder, f"{field}.bin"), "wb")
+            for field in fields
+        }
+        # Dates are written as days since epoch first, and converted to calendar positions once the calendar is known.
+        days_path = os.path.join(temp_folder, "days.bin")
+        days_file = open(days_path, "wb")
+        calendar = np.array([], dtype="int32")
+        stored_tickers = []
+        offsets = [0]
+        try:
+            for ticker in tickers:
+                df = price_store.read(ticker)
+                if df is None or df.empty:
+                    continue
+                days = df.index.values.astype("datetime64[D]").astype("int32")
+                for field in fields:
+                    if field in df.columns:
+                        values = df[field].to_numpy(dtype="float64")
+                    else:
+                        values = np.full(len(df), np.nan)
+                    field_files[field].write(values.tobytes())
+                days_file.write(days.tobytes())
+                calendar = np.union1d(calendar, days)
+                stored_tickers.append(ticker.upper())
+                offsets.append(offsets[-1] + len(df))
+                if log_data:
+                    print(f"[Universe] {ticker}: {len(df)} rows")
+        finally:
+            for f in field_files.values():
+                f.close()
+            days_file.close()
+
+        total_rows = offsets[-1]
+        # Convert the days into positions within the calendar, in chunks to keep memory bounded.
+        if total_rows > 0:
+            days = np.memmap(days_path, dtype="int32", mode="r", shape=(total_rows,))
+            positions = np.memmap(
+                os.path.join(temp_folder, "dates.bin"),
+                dtype="int32",
+                mode="w+",
+                shape=(total_rows,),
+            )
+            chunk_size = 1_000_000
+            for start in range(0, total_rows, chunk_size):
+                positions[start : start + chunk_size] = np.searchsorted(
+                    calendar, days[start : start + chunk_size]
+                )
+            positions.flush()
+            del days, positions
+        else:
+            open(os.path.join(temp_folder, "dates.bin"), "wb").close()
+        os.remove(days_path)
+
+        np.save(
+            os.path.join(temp_folder, "calendar.npy"), calendar.astype("datetime64[D]")
+        )
+        np.save(os.path.join(temp_folder, "offsets.npy"), np.array(offsets, "int64"))
+        with open(os.path.join(temp_folder, "meta.json"), "w") as f:
+            json.dump(
+                {"tickers": stored_tickers, "fields": fields, "rows": total_rows}, f
+            )
+
+        # Point readers at the new version. Replacing the small pointer file works even while old versions are mapped.
+        temp_pointer = f"{self.pointer_file}.tmp"
+        with open(temp_pointer, "w") as f:
+            f.write(version)
+        os.replace(temp_pointer, self.pointer_file)
+        self.remove_old_versions(version)
+
+    """-------------------------------"""
+
+    def remove_old_versions(self, version: str) -> None:
+        """
+        Delete every version folder other than "version", and the files of the unversioned layout.
+        Files that are still mapped cannot be deleted on Windows. They are skipped and removed by a later build.
+        """
+        for name in os.listdir(self.folder_path):
+            path = os.path.join(self.folder_path, name)
+            if name == version or path == self.pointer_file:
+                continue
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    """-------------------------------"""
+
+    def get_data_path(self) -> str:
+        """
+        :return: Folder of the current version. Stores built before versioning keep their files in "folder_path".
+        """
+        if os.path.exists(self.pointer_file):
+            with open(self.pointer_file) as f:
+                return os.path.join(self.folder_path, f.read().strip())
+        return self.folder_path
+
+    """-------------------------------"""
+
+    def open(self) -> None:
+        """
+        Map the store into memory. Nothing is read from disk until the arrays are accessed.
+        """
+        self.data_path = self.get_data_path()
+        with open(os.path.join(self.data_path, "meta.json")) as f:
+            meta = json.load(f)
+        self.tickers = meta["tickers"]
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        rows = meta["rows"]
+        self.calendar = np.load(os.path.join(self.data_path, "calendar.npy"))
+        self.offsets = np.load(os.path.join(self.data_path, "offsets.npy"))
+        self.fields = {}
+        for field in meta["fields"]:
+            self.fields[field] = self.map_array(f"{field}.bin", "float64", rows)
+        self.dates = self.map_array("dates.bin", "int32", rows)
+        self.is_open = True
+
+    """-------------------------------"""
+
+    def map_array(self, file_name: str, dtype: str, rows: int):
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            os.path.join(self.data_path, file_name),
+            dtype=dtype,
+            mode="r",
+            shape=(rows,),
+        )
+
+    """-------------------------------"""
+
+    def close(self) -> None:
+        self.fields = {}
+        self.dates = None
+        self.is_open = False
+
+    """-------------------------------"""
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.get_data_path(), "meta.json"))
+
+    """-------------------------------"""
+
+    def get_bounds(self, ticker: str) -> tuple:
+        if not self.is_open:
+            self.open()
+        i = self.ticker_index[ticker.upper()]
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    """-------------------------------"""
+
+    def get_values(self, ticker: str, field: str = "Close") -> np.ndarray:
+        """
+        :return: Read-only view into the memory-mapped array. No data is copied.
+        """
+        start, end = self.get_bounds(ticker)
+        return self.fields[field][start:end]
+
+    """-------------------------------"""
+
+    def get_dates(self, ticker: str) -> np.ndarray:
+        """
+        :return: datetime64[D] dates for the rows returned by get_values.
+        """
+        start, end = self.get_bounds(ticker)
+        return self.calendar[self.dates[start:end]]
+
+    """-------------------------------"""
+
+    def iter_values(self, field: str = "Close"):
+        """
+        Yields (ticker, view) for every ticker. Useful for scans that only need one field.
+        """
+        if not self.is_open:
+            self.open()
+        data = self.fields[field]
+        for i, ticker in enumerate(self.tickers):
+            yield ticker, data[self.offsets[i] : self.offsets[i + 1]]
+
+    """-------------------------------"""
+
+    def get_matrix(
+        self,
+        field: str = "Close",
+        tickers: list = None,
+        start: str = None,
+        end: str = None,
+    ) -> pd.DataFrame:
+        """
+        Align a field into a dates x tickers frame on the shared calendar. Unlike get_values this copies the data.
+
+        :param start: First date to include. Ex: 2020-01-01
+        :param end: Last date to include.
+        """
+        if not self.is_open:
+            self.open()
+        if tickers is None:
+            tickers = self.tickers
+        tickers = [t.upper() for t in tickers]
+        first = (
+            0
+            if start is None
+            else np.searchsorted(self.calendar, np.datetime64(start, "D"))
+        )
+        last = (
+            len(self.calendar)
+            if end is None
+            else np.searchsorted(self.calendar, np.datetime64(end, "D"), side="right")
+        )
+        matrix = np.full((last - first, len(tickers)), np.nan)
+        for col, ticker in enumerate(tickers):
+            row_start, row_end = self.get_bounds(ticker)
+            positions = self.dates[row_start:row_end]
+            # Rows are sorted by date, so the window is a contiguous slice.
+            lo, hi = np.searchsorted(positions, [first, last])
+            matrix[positions[lo:hi] - first, col] = self.fields[field][
+                row_start + lo : row_start + hi
+            ]
+        index = pd.DatetimeIndex(self.calendar[first:last], name="Date")
+        return pd.DataFrame(matrix, index=index, columns=tickers)
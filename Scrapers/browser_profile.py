@@ -0,0 +1,79 @@
+# Selenium imports
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# Desktop Chrome user agent. Headless Chrome announces itself as "HeadlessChrome", which some sites answer with an empty page.
+user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+# Requests that the scrapers never need. Blocked in the "fast" profile.
+blocked_resources = ["*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+blocked_hosts = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.com*",
+    "*amazon-adsystem.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*quantserve.com*",
+    "*scorecardresearch.com*",
+    "*adnxs.com*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*criteo.com*",
+    "*pubmatic.com*",
+    "*rubiconproject.com*",
+]
+
+"""
+Browser profiles:
+    visible: A normal Chrome window. Useful to watch a scrape.
+    headless: No window, a desktop sized viewport and user agent, and pages are handed over as soon as the DOM is ready.
+    fast: "headless", without images, stylesheets, fonts, media, ads or analytics.
+"""
+profiles = ["visible", "headless", "fast"]
+
+
+def create_options(profile: str = "fast") -> webdriver.ChromeOptions:
+    """
+    :param profile: One of "profiles".
+    :return: ChromeOptions for the profile.
+    """
+    if profile not in profiles:
+        raise ValueError(f"Unknown browser profile: {profile}. Options: {profiles}")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-popup-blocking")
+    if profile == "visible":
+        return options
+
+    options.add_argument("--headless=new")
+    # Tables are laid out for desktop widths. A small headless viewport can render the mobile layout instead.
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={user_agent}")
+    options.add_argument("--disable-dev-shm-usage")
+    # Return from get() once the DOM is parsed, instead of waiting for every image and script.
+    options.page_load_strategy = "eager"
+    if profile == "fast":
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+
+def setup_driver(driver, profile: str = "fast") -> None:
+    """
+    Settings that can only be applied to a running driver. Called once for every new driver.
+    """
+    if profile != "fast":
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": blocked_resources + blocked_hosts}
+        )
+    except WebDriverException as e:
+        print(f"[Warning] Could not block requests: {e}")
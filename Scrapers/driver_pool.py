@@ -0,0 +1,221 @@
+# Operating system imports
+import atexit
+
+# Threading
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Selenium imports
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+
+from FinancialScrapers.Scrapers.browser_profile import create_options, setup_driver
+
+
+class DriverPool:
+    """
+    Pool of long-lived Chrome drivers shared by the scrapers.
+
+    Drivers are checked out, used for a page, and returned. A driver is checked for health before it is handed out,
+    and replaced after "max_pages" uses to keep memory from growing. Every driver is quit when the pool is closed,
+    which also happens automatically when the interpreter exits.
+    """
+
+    def __init__(
+        self,
+        driver_path: str,
+        options=None,
+        size: int = 2,
+        max_pages: int = 50,
+        setup=None,
+        checkout_timeout: float = 300,
+    ) -> None:
+        """
+        :param driver_path: Path to the chrome driver executable.
+        :param options: ChromeOptions used for every driver.
+        :param size: Maximum number of drivers alive at the same time. Also the number of parallel workers.
+        :param max_pages: Number of uses before a driver is replaced.
+        :param setup: Function called with every new driver. Ex: To block requests.
+        :param checkout_timeout: Seconds checkout() waits for a free driver before it raises TimeoutError.
+        """
+        self.driver_path = driver_path
+        self.options = options
+        self.setup = setup
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.idle = deque()
+        # Driver -> number of times it was checked out.
+        self.page_counts = {}
+        # Not bounded, so resize() can add slots.
+        self.slots = threading.Semaphore(size)
+        self.lock = threading.Lock()
+        self.closed = False
+        atexit.register(self.close)
+
+    """-------------------------------"""
+
+    def create_driver(self):
+        service = Service(executable_path=self.driver_path)
+        driver = webdriver.Chrome(service=service, options=self.options)
+        if self.setup is not None:
+            self.setup(driver)
+        self.page_counts[driver] = 0
+        return driver
+
+    """-------------------------------"""
+
+    def is_healthy(self, driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    """-------------------------------"""
+
+    def quit_driver(self, driver) -> None:
+        self.page_counts.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    """-------------------------------"""
+
+    def checkout(self, timeout: float = None):
+        """
+        :param timeout: Seconds to wait for a free driver. Defaults to "checkout_timeout".
+        :return: A driver. Blocks while "size" drivers are already checked out.
+        """
+        if self.closed:
+            raise RuntimeError("Driver pool is closed.")
+        if timeout is None:
+            timeout = self.checkout_timeout
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(
+                f"No driver was returned to the pool within {timeout} seconds. "
+                f"All {self.size} drivers are checked out, one may not have been released."
+            )
+        try:
+            while True:
+                with self.lock:
+                    driver = self.idle.popleft() if self.idle else None
+                if driver is None:
+                    driver = self.create_driver()
+                    break
+                if self.is_healthy(driver):
+                    break
+                # Crashed or closed by the site. Replace it.
+                self.quit_driver(driver)
+            self.page_counts[driver] += 1
+            return driver
+        except Exception:
+            self.slots.release()
+            raise
+
+    """-------------------------------"""
+
+    def checkin(self, driver) -> None:
+        """
+        Return a driver to the pool. Drivers that reached "max_pages" are quit instead.
+        """
+        try:
+            if self.closed or self.page_counts.get(driver, 0) >= self.max_pages:
+                self.quit_driver(driver)
+            else:
+                with self.lock:
+                    self.idle.append(driver)
+        finally:
+            self.slots.release()
+
+    """-------------------------------"""
+
+    def resize(self, size: int) -> None:
+        """
+        Allow up to "size" drivers at the same time. The pool only grows, a smaller size is ignored.
+        """
+        with self.lock:
+            added = size - self.size
+            if added <= 0:
+                return
+            self.size = size
+        for _ in range(added):
+            self.slots.release()
+
+    """-------------------------------"""
+
+    @contextmanager
+    def driver(self):
+        """
+        Ex:
+            with pool.driver() as browser:
+                browser.get(url)
+        """
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    """-------------------------------"""
+
+    def map(self, func, items: list, workers: int = None) -> list:
+        """
+        Run func(driver, item) for every item, using up to "workers" drivers in parallel.
+
+        :return: Results in the same order as "items". Failed items return None.
+        """
+        if workers is None:
+            workers = self.size
+
+        def run(item):
+            try:
+                with self.driver() as driver:
+                    return func(driver, item)
+            except Exception as e:
+                print(f"[Error] {item}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+
+    """-------------------------------"""
+
+    def close(self) -> None:
+        self.closed = True
+        with self.lock:
+            self.idle.clear()
+        # Includes drivers that are still checked out.
+        for driver in list(self.page_counts):
+            self.quit_driver(driver)
+
+
+# Pools shared by every scraper, one per chrome driver executable and browser profile.
+driver_pools = {}
+driver_pools_lock = threading.Lock()
+
+
+def get_driver_pool(
+    driver_path: str, profile: str = "fast", size: int = 2
+) -> DriverPool:
+    """
+    :param profile: Browser profile of the drivers. See browser_profile.profiles.
+    :param size: Drivers allowed at the same time. An existing pool grows to "size" if it is smaller.
+    :return: The shared pool for "driver_path" and "profile".
+    """
+    key = (driver_path, profile)
+    with driver_pools_lock:
+        if key not in driver_pools:
+            driver_pools[key] = DriverPool(
+                driver_path,
+                create_options(profile),
+                size=size,
+                setup=lambda driver: setup_driver(driver, profile),
+            )
+        else:
+            driver_pools[key].resize(size)
+        return driver_pools[key]
@@ -9,33 +9,71 @@ import pandas as pd
 
 # Selenium imports
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Web requests
-import requests
 import yfinance as yf
+from FinancialScrapers.Scrapers.http_transport import get_transport
 
+# Local response cache
+from FinancialScrapers.Scrapers.response_cache import ResponseCache
+from FinancialScrapers.Scrapers.rate_limiter import RequestScheduler
+from FinancialScrapers.Scrapers.driver_pool import get_driver_pool
 
 # Get the current working directory.
 cwd = os.getcwd()
 
-# Selenium browser settings
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_argument("--no-sandbox")
-# chrome_options.add_argument("--headless")
-chrome_options.add_argument("--disable-gpu")
+# Selenium browser settings are shared by every scraper. See browser_profile.py.
+
+# Every Alpha Vantage request goes through this scheduler, so all scrapers share the same quota.
+# Defaults match the free tier. Set "alpha_vantage_requests_per_day" to 0 for plans without a daily quota.
+# Requests that would wait longer than "alpha_vantage_max_wait" seconds for the quota fail instead. 0 to always wait.
+alpha_vantage_scheduler = RequestScheduler(
+    requests_per_minute=int(os.getenv("alpha_vantage_requests_per_minute", 5)),
+    requests_per_day=int(os.getenv("alpha_vantage_requests_per_day", 25)),
+    max_wait=float(os.getenv("alpha_vantage_max_wait", 3600)) or None,
+)
+
+# Alpha Vantage function for each financial statement.
+statement_functions = {
+    "income_statement": "INCOME_STATEMENT",
+    "balance_sheet": "BALANCE_SHEET",
+    "cash_flow": "CASH_FLOW",
+}
 
 
 class EquityScraper:
-    def __init__(self, driver_path: str) -> None:
-        self.chrome_drive = driver_path
+    def __init__(
+        self,
+        driver_path: str,
+        cache_folder: str = None,
+        offline: bool = False,
+        sec_scraper=None,
+        browser_profile: str = "fast",
+    ) -> None:
+        """
+        :param cache_folder: Folder for the Alpha Vantage response cache. If None, responses are not cached.
+        :param offline: Only serve Alpha Vantage responses from the cache. Requires "cache_folder".
+        :param browser_profile: Chrome profile used when a browser is needed. "visible", "headless" or "fast".
+        :param sec_scraper: SecScraper used to read filings from the SEC submissions JSON. If None, EDGAR is browsed with Chrome.
+        """
+        self.chrome_driver = driver_path
+        self.browser_profile = browser_profile
+        self.sec_scraper = sec_scraper
+        # Driver checked out of the shared pool. None while no page is open.
+        self.browser = None
         self.key = os.getenv("alpha_vantage_key")
 
         # Root url to make queries.
         self.root_url = "https://www.alphavantage.co/query"
+        # Raw responses are cached on disk, so duplicate requests inside the TTL window are free.
+        self.response_cache = (
+            ResponseCache(cache_folder, offline=offline)
+            if cache_folder is not None
+            else None
+        )
 
         # Variables for financial statements.
         self.income_statement = pd.DataFrame()
@@ -61,10 +99,27 @@ class EquityScraper:
         This function will search the SEC EDGAR database, find the most recent 10-K, and return the period of report for that 10-k.
         :return: str of the end date of the fiscal year."""
         ticker = ticker.upper()
+        # The submissions JSON holds the period of report of every filing, so no browser is needed.
+        if self.sec_scraper is not None:
+            period_of_report = self.sec_scraper.get_fiscal_year_end_date(ticker)
+            if period_of_report is not None:
+                return period_of_report
         sec_annual_url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={ticker}&type=10-k&dateb=&owner=include&count=100&search_text="
 
         self.create_browser(sec_annual_url)
+        # The pooled driver is returned even if the lookup fails.
+        try:
+            return self.find_period_of_report()
+        finally:
+            self.release_browser()
 
+    """-------------------------------"""
+
+    def find_period_of_report(self) -> str:
+        """
+        Walk the filings table of the SEC browse page that is open in the browser, until the first 10-K.
+        :return: str of the period of report of that 10-K.
+        """
         # Loop vars
         running = True
         filing_index = 2
@@ -363,8 +418,11 @@ class EquityScraper:
         :param url: The website to visit.
         :return: None
         """
-        service = Service(executable_path=self.chrome_driver)
-        self.browser = webdriver.Chrome(service=service, options=chrome_options)
+        # Reuse a driver from the shared pool instead of launching Chrome for every page.
+        self.release_browser()
+        self.browser = get_driver_pool(
+            self.chrome_driver, self.browser_profile
+        ).checkout()
         # Default browser route
         if url == None:
             self.browser.get(url=self.sec_quarterly_url)
@@ -374,6 +432,16 @@ class EquityScraper:
 
     """-----------------------------------"""
 
+    def release_browser(self) -> None:
+        """
+        Return the driver to the shared pool.
+        """
+        if self.browser is not None:
+            browser, self.browser = self.browser, None
+            get_driver_pool(self.chrome_driver, self.browser_profile).checkin(browser)
+
+    """-----------------------------------"""
+
     def read_data(self, xpath: str, wait: bool = False, wait_time: int = 5) -> str:
         """
         :param xpath: Path to the web element.
@@ -536,25 +604,18 @@ class EquityScraper:
         elif frequency in self.annual_params:
             frequency = "annualEarnings"
 
-        # Construct the API request URL
-        endpoint = "https://www.alphavantage.co/query"
-        params = {"function": "EARNINGS", "symbol": ticker, "apikey": self.key}
-
         # Make the API request
-        response = requests.get(endpoint, params=params)
-        data = pd.DataFrame()
-
-        if response.status_code == 200:
-            # Parse the JSON response
-            try:
-                data = response.json()[frequency]
-            except KeyError:
-                print(f"Response: {response.json()}")
-                print(f"Ticker: {ticker}")
-            df = pd.DataFrame(data)
-            return df["fiscalDateEnding"]
-        else:
+        data = self.query_alpha_vantage("EARNINGS", symbol=ticker)
+        if data is None:
             print(f"[Error] Retrieving Fiscal Dates")
+            return None
+        try:
+            df = pd.DataFrame(data[frequency])
+        except KeyError:
+            print(f"Response: {data}")
+            print(f"Ticker: {ticker}")
+            return None
+        return df["fiscalDateEnding"]
 
     """-------------------------------"""
 
@@ -564,40 +625,79 @@ class EquityScraper:
         elif frequency in self.annual_params:
             frequency = "annualEarnings"
         ticker = ticker.upper()
-        # Construct the API request URL
-        endpoint = "https://www.alphavantage.co/query"
-        params = {"function": "EARNINGS", "symbol": ticker, "apikey": self.key}
-
         # Make the api request.
-        response = requests.get(endpoint, params=params)
-
-        if response.status_code == 200:
-            # Parse the JSON response
-            data = response.json()[frequency]
-            df = pd.DataFrame(data)
-            return df
-        else:
+        data = self.query_alpha_vantage("EARNINGS", symbol=ticker)
+        if data is None:
             print(f"[Error] Retrieving Earnings Estimates")
+            return None
+        df = pd.DataFrame(data[frequency])
+        return df
 
     """-------------------------------"""
 
     def get_income_statement(self, ticker: str, period: str = "q") -> pd.DataFrame:
-        query = self.build_query(ticker=ticker, func="INCOME_STATEMENT")
-        r = requests.get(query)
-        data = r.json()
-        df = None
-        # Create a dataframe.
-        if period in self.quarterly_params:
+        reports = self.get_statement_reports(ticker, "income_statement")
+        return self.select_report(reports, period)
+
+    """-------------------------------"""
+
+    def get_balance_sheet(self, ticker: str, period: str = "q") -> pd.DataFrame:
+        reports = self.get_statement_reports(ticker, "balance_sheet")
+        return self.select_report(reports, period)
+
+    """-------------------------------"""
+
+    def get_cash_flow(self, ticker: str, period: str) -> pd.DataFrame:
+        reports = self.get_statement_reports(ticker, "cash_flow")
+        return self.select_report(reports, period)
+
+    """-------------------------------"""
+
+    def get_statement_reports(self, ticker: str, statement: str) -> dict:
+        """
+        Alpha Vantage returns the quarterly and annual reports in the same response, so both are kept from a single request.
+
+        :param statement: "income_statement", "balance_sheet" or "cash_flow".
+        :return: Dictionary with the keys "quarterly" and "annual". None if the request failed.
+        """
+        data = self.query_alpha_vantage(
+            statement_functions[statement], symbol=ticker.upper()
+        )
+        if data is None:
+            return None
+        reports = {}
+        for freq, report_key in [
+            ("quarterly", "quarterlyReports"),
+            ("annual", "annualReports"),
+        ]:
             try:
-                df = pd.DataFrame(data["quarterlyReports"])
+                df = pd.DataFrame(data[report_key])
             except KeyError:
                 print(f"Response: {data}")
+                return None
+            df = self.format_statement(df)
+            if statement == "cash_flow":
+                df = self.add_free_cash_flow(df)
+            reports[freq] = df
+        return reports
+
+    """-------------------------------"""
+
+    def select_report(self, reports: dict, period: str) -> pd.DataFrame:
+        """
+        :param reports: Dictionary returned by get_statement_reports.
+        :param period: Frequency of the report to return.
+        """
+        if reports is None:
+            return None
+        if period in self.quarterly_params:
+            return reports["quarterly"]
         elif period in self.annual_params:
-            try:
-                df = pd.DataFrame(data["annualReports"])
-            except KeyError:
-                print(f"Response: {data}")
-                return
+            return reports["annual"]
+
+    """-------------------------------"""
+
+    def format_statement(self, df: pd.DataFrame) -> pd.DataFrame:
         # Make the row index the dates of the filing.
         df.set_index("fiscalDateEnding", inplace=True)
         # Transpose the dataframe to swap the row labels with the column labels. We want the dates to be the column.
@@ -608,73 +708,93 @@ class EquityScraper:
 
     """-------------------------------"""
 
-    def get_balance_sheet(self, ticker: str, period: str = "q") -> pd.DataFrame:
-        # Create a query
-        query = self.build_query(ticker=ticker.upper(), func="BALANCE_SHEET")
-        r = requests.get(query)
-        data = r.json()
-        df = None
-        # Create a dataframe.
-        if period in self.quarterly_params:
-            try:
-                df = pd.DataFrame(data["quarterlyReports"])
-            except KeyError:
-                print(f"Response: {data}")
-        elif period in self.annual_params:
-            try:
-                df = pd.DataFrame(data["annualReports"])
-            except KeyError:
-                print(f"Response: {data}")
-                return
-        # Make the index the dates of the period of report.
-        df.set_index("fiscalDateEnding", inplace=True)
-        # Transpose the dataframe to swap the row labels with the column labels.
-        df = df.transpose()
-        # Reverse the order of the columns. We want the olders filing on the lft, and the newest ones on the right.
-        df = df.iloc[:, ::-1]
+    def add_free_cash_flow(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Calculate the FCF as alpha vantage does not provide it by default.
+        op_cashflow = pd.to_numeric(df.loc["operatingCashflow"], errors="coerce")
+        # Missing values are reported as the string "None".
+        capex = pd.to_numeric(df.loc["capitalExpenditures"], errors="coerce")
+        df.loc["freeCashflow"] = op_cashflow - capex
         return df
 
     """-------------------------------"""
+    """-----------------------------------"""
 
-    def get_cash_flow(self, ticker: str, period: str) -> pd.DataFrame:
-        # Create a query
-        query = self.build_query(ticker=ticker.upper(), func="CASH_FLOW")
-        r = requests.get(query)
-        data = r.json()
-        df = None
-        # Create a dataframe.
-        if period in self.quarterly_params:
-            try:
-                df = pd.DataFrame(data["quarterlyReports"])
-            except KeyError:
-                print(f"Response: {data}")
-                return
-        elif period in self.annual_params:
-            try:
-                df = pd.DataFrame(data["annualReports"])
-            except KeyError:
-                print(f"Response: {data}")
-                return
-        # Make the index the dates of the period of report.
-        df.set_index("fiscalDateEnding", inplace=True)
-        # Transpose the dataframe to swap the row labels with the column labels.
-        df = df.transpose()
-        # Reverse the order of the columns. We want the olders filing on the lft, and the newest ones on the right.
-        df = df.iloc[:, ::-1]
-        # Calculate the FCF as alpha vantage does not provide it by default.
-        op_cashflow = df.loc["operatingCashflow"].astype(float)
+    def query_alpha_vantage(self, function: str, priority: int = 10, **params) -> dict:
+        """
+        Every Alpha Vantage request goes through this function.
+
+        :param function: Alpha Vantage function. Ex: EARNINGS
+        :param priority: Position in the request scheduler's queue. Lower numbers run first.
+        :param params: Other query parameters. Ex: symbol="AAPL"
+        :return: Parsed JSON response, or None if the request failed.
+        """
+        if self.response_cache is not None:
+            data = self.response_cache.get(function, params)
+            if data is not None:
+                return data
+            if self.response_cache.offline:
+                print(f"[Offline] No cached response for {function} {params}")
+                return None
+
+        query_params = {"function": function, **params, "apikey": self.key}
         try:
-            capex = df.loc["capitalExpenditures"].astype(float)
-            df.loc["freeCashflow"] = op_cashflow - capex
-        except ValueError:
-            capex = self.cash_flow.loc["capitalExpenditures"]
-            df.loc["freeCashflow"] = op_cashflow - capex
-        return df
+            data = alpha_vantage_scheduler.call(
+                self.send_request,
+                query_params,
+                priority=priority,
+                is_throttled=self.is_throttled,
+            )
+        except TimeoutError as e:
+            print(f"[Error] {function} {params}: {e}")
+            return None
+        if data is None:
+            return None
+        # Error and rate limit messages are not cached, so they are retried on the next request.
+        if self.is_throttled(data):
+            print(f"[Throttled] {function} {params}: {data}")
+            return None
+        is_error = any(key in data for key in ["Error Message", "Note", "Information"])
+        if self.response_cache is not None and not is_error:
+            self.response_cache.put(function, params, data)
+        return data
+
+    """-------------------------------"""
+
+    def send_request(self, query_params: dict) -> dict:
+        response = get_transport().get(self.root_url, params=query_params)
+        if response.status_code != 200:
+            print(
+                f"[Error] {query_params['function']} returned status {response.status_code}"
+            )
+            return None
+        return response.json()
+
+    """-------------------------------"""
+
+    def is_throttled(self, data) -> bool:
+        """
+        Alpha Vantage returns status 200 when a quota is hit, with a "Note" or "Information" message instead of the data.
+        """
+        if not isinstance(data, dict):
+            return False
+        message = str(data.get("Note", "")) + str(data.get("Information", ""))
+        message = message.lower()
+        return any(
+            phrase in message
+            for phrase in ["call frequency", "rate limit", "requests per day"]
+        )
+
+    """-------------------------------"""
+
+    def get_request_stats(self) -> dict:
+        """
+        :return: Completed and throttled requests, and the achieved requests per minute.
+        """
+        return alpha_vantage_scheduler.stats()
 
     """-------------------------------"""
-    """-----------------------------------"""
 
     def build_query(self, ticker: str, func: str) -> str:
-        end_point = f"query?function={func}&symbol={ticker.upper()}&apikey={self.key}"
+        end_point = f"?function={func}&symbol={ticker.upper()}&apikey={self.key}"
         query = self.root_url + end_point
         return query
@@ -0,0 +1,366 @@
+# Operating system imports
+import os
+
+# Serialization
+import json
+import zipfile
+
+# Pandas imports
+import pandas as pd
+
+# Parquet imports. Optional, the fact store is unavailable when pyarrow is not installed.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+from FinancialScrapers.Scrapers.http_transport import get_transport
+
+# SEC bulk archive holding the XBRL company facts of every company. Updated nightly.
+bulk_companyfacts_url = (
+    "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip"
+)
+
+# Columns of the fact store, in file order.
+fact_columns = [
+    "cik",
+    "taxonomy",
+    "tag",
+    "unit",
+    "start",
+    "end",
+    "value",
+    "fy",
+    "fp",
+    "form",
+    "filed",
+    "accn",
+]
+
+fact_schema = None
+if pa is not None:
+    fact_types = {
+        "cik": pa.int64(),
+        "start": pa.date32(),
+        "end": pa.date32(),
+        "value": pa.float64(),
+        "fy": pa.int32(),
+        "filed": pa.date32(),
+    }
+    fact_schema = pa.schema(
+        [(name, fact_types.get(name, pa.string())) for name in fact_columns]
+    )
+
+# Fields of the Alpha Vantage statements, and the us-gaap tags that report them. Companies change tags over time,
+# so every tag of a field is read and the first one listed wins where they overlap.
+statement_tags = {
+    "income_statement": {
+        "totalRevenue": [
+            "Revenues",
+            "RevenueFromContractWithCustomerExcludingAssessedTax",
+            "SalesRevenueNet",
+        ],
+        "costOfRevenue": ["CostOfRevenue", "CostOfGoodsAndServicesSold"],
+        "grossProfit": ["GrossProfit"],
+        "researchAndDevelopment": ["ResearchAndDevelopmentExpense"],
+        "sellingGeneralAndAdministrative": ["SellingGeneralAndAdministrativeExpense"],
+        "operatingExpenses": ["OperatingExpenses"],
+        "operatingIncome": ["OperatingIncomeLoss"],
+        "interestExpense": ["InterestExpense"],
+        "incomeBeforeTax": [
+            "IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest"
+        ],
+        "incomeTaxExpense": ["IncomeTaxExpenseBenefit"],
+        "depreciationAndAmortization": [
+            "DepreciationDepletionAndAmortization",
+            "DepreciationAndAmortization",
+        ],
+        "netIncome": ["NetIncomeLoss"],
+    },
+    "balance_sheet": {
+        "totalAssets": ["Assets"],
+        "totalCurrentAssets": ["AssetsCurrent"],
+        "cashAndCashEquivalentsAtCarryingValue": [
+            "CashAndCashEquivalentsAtCarryingValue"
+        ],
+        "inventory": ["InventoryNet"],
+        "currentNetReceivables": ["AccountsReceivableNetCurrent"],
+        "propertyPlantEquipment": ["PropertyPlantAndEquipmentNet"],
+        "goodwill": ["Goodwill"],
+        "totalLiabilities": ["Liabilities"],
+        "totalCurrentLiabilities": ["LiabilitiesCurrent"],
+        "currentAccountsPayable": ["AccountsPayableCurrent"],
+        "longTermDebt": ["LongTermDebt", "LongTermDebtNoncurrent"],
+        "totalShareholderEquity": ["StockholdersEquity"],
+        "retainedEarnings": ["RetainedEarningsAccumulatedDeficit"],
+        "commonStockSharesOutstanding": ["CommonStockSharesOutstanding"],
+    },
+    "cash_flow": {
+        "operatingCashflow": ["NetCashProvidedByUsedInOperatingActivities"],
+        "capitalExpenditures": ["PaymentsToAcquirePropertyPlantAndEquipment"],
+        "depreciationDepletionAndAmortization": [
+            "DepreciationDepletionAndAmortization",
+            "DepreciationAndAmortization",
+        ],
+        "cashflowFromInvestment": ["NetCashProvidedByUsedInInvestingActivities"],
+        "cashflowFromFinancing": ["NetCashProvidedByUsedInFinancingActivities"],
+        "dividendPayout": ["PaymentsOfDividends", "PaymentsOfDividendsCommonStock"],
+        "paymentsForRepurchaseOfCommonStock": ["PaymentsForRepurchaseOfCommonStock"],
+        "netIncome": ["NetIncomeLoss"],
+    },
+}
+
+
+def parse_company_facts(data: dict, cik: int = None, taxonomies: list = None) -> dict:
+    """
+    Flatten a companyfacts JSON into columns. One row per reported value.
+
+    :param data: companyfacts JSON. Ex: {"cik": 320193, "facts": {"us-gaap": {"Assets": {"units": {"USD": [...]}}}}}
+    :param cik: CIK of the company. Defaults to the "cik" of the JSON.
+    :param taxonomies: Taxonomies to keep. Ex: ["us-gaap", "dei"]. None keeps every taxonomy.
+    :return: Dictionary of column: list, with the columns of "fact_columns". Dates are strings.
+    """
+    if cik is None:
+        cik = int(data["cik"])
+    columns = {name: [] for name in fact_columns}
+    for taxonomy, tags in data.get("facts", {}).items():
+        if taxonomies is not None and taxonomy not in taxonomies:
+            continue
+        for tag, fact in tags.items():
+            for unit, values in fact.get("units", {}).items():
+                for v in values:
+                    columns["taxonomy"].append(taxonomy)
+                    columns["tag"].append(tag)
+                    columns["unit"].append(unit)
+                    # Instant facts (Ex: balance sheet) have no start.
+                    columns["start"].append(v.get("start"))
+                    columns["end"].append(v.get("end"))
+                    columns["value"].append(v.get("val"))
+                    columns["fy"].append(v.get("fy"))
+                    columns["fp"].append(v.get("fp"))
+                    columns["form"].append(v.get("form"))
+                    columns["filed"].append(v.get("filed"))
+                    columns["accn"].append(v.get("accn"))
+    columns["cik"] = [cik] * len(columns["tag"])
+    return columns
+
+
+def facts_to_frame(columns: dict) -> pd.DataFrame:
+    """
+    :param columns: Output of parse_company_facts.
+    :return: DataFrame with typed columns. Dates are datetime64.
+    """
+    df = pd.DataFrame(columns, columns=fact_columns)
+    for col in ["start", "end", "filed"]:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    df["fy"] = pd.to_numeric(df["fy"], errors="coerce").astype("Int32")
+    return df
+
+
+def to_table(df: pd.DataFrame) -> "pa.Table":
+    df = df.copy()
+    for col in ["start", "end", "filed"]:
+        df[col] = df[col].dt.date
+    return pa.Table.from_pandas(df, schema=fact_schema, preserve_index=False)
+
+
+def select_periods(facts: pd.DataFrame, freq: str) -> pd.Series:
+    """
+    :param facts: Facts of a single tag and unit.
+    :param freq: "quarterly" or "annual".
+    :return: Series of values indexed by the end of the period, oldest first.
+    """
+    facts = facts.sort_values("filed")
+    if facts["start"].isna().all():
+        # Instant values. Annual reports only keep the fiscal year ends, which are the ones reported in annual filings.
+        if freq == "annual":
+            facts = facts[facts["fp"] == "FY"]
+        # Restated values replace the original ones.
+        series = facts.drop_duplicates("end", keep="last").set_index("end")["value"]
+        return series.sort_index()
+
+    # Restated values replace the original ones.
+    facts = facts.drop_duplicates(["start", "end"], keep="last")
+
+    days = (facts["end"] - facts["start"]).dt.days
+    if freq == "annual":
+        series = facts[days.between(350, 380)].set_index("end")["value"]
+        return series[~series.index.duplicated(keep="last")].sort_index()
+
+    quarters = facts[days.between(80, 100)].set_index("end")["value"]
+    # Cash flows are reported year to date, and Q4 is only in the annual report. A missing quarter is the
+    # difference between two year to date values with the same start, three months apart.
+    longer = facts[days > 100][["start", "end", "value"]]
+    pairs = longer.merge(
+        facts[["start", "end", "value"]], on="start", suffixes=("", "_prev")
+    )
+    gap = (pairs["end"] - pairs["end_prev"]).dt.days
+    pairs = pairs[gap.between(80, 100)]
+    derived = pd.Series(
+        (pairs["value"] - pairs["value_prev"]).to_numpy(), index=pairs["end"]
+    )
+    series = pd.concat([quarters, derived])
+    return series[~series.index.duplicated(keep="first")].sort_index()
+
+
+def build_statement(facts: pd.DataFrame, statement: str, freq: str) -> pd.DataFrame:
+    """
+    Build a statement in the same layout as the Alpha Vantage statements. One row per field,
+    one column per period ("YYYY-MM-DD"), oldest on the left.
+
+    :param facts: Facts of a single company.
+    :param statement: "income_statement", "balance_sheet" or "cash_flow".
+    :param freq: "quarterly" or "annual".
+    """
+    rows = {}
+    for field, tags in statement_tags[statement].items():
+        series = None
+        for tag in tags:
+            tag_facts = facts[facts["tag"] == tag]
+            if tag_facts.empty:
+                continue
+            # Most values of a tag share one unit. Ex: "USD" or "shares"
+            unit = tag_facts["unit"].value_counts().index[0]
+            values = select_periods(tag_facts[tag_facts["unit"] == unit], freq)
+            series = values if series is None else series.combine_first(values)
+        if series is not None:
+            rows[field] = series
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows).T.sort_index(axis=1)
+    df.columns = pd.Index(df.columns.strftime("%Y-%m-%d"), name="fiscalDateEnding")
+    return df
+
+
+class FactStore:
+    """
+    Columnar table of XBRL facts for every company, keyed by cik, tag, unit and period.
+
+    Files:
+        facts.parquet: One row per reported value with the columns of "fact_columns".
+        row_groups.json: CIK -> row groups of facts.parquet holding its facts.
+    """
+
+    def __init__(self, folder_path: str, row_group_size: int = 500000) -> None:
+        """
+        :param folder_path: Folder holding the store files.
+        :param row_group_size: Rows buffered before they are written. Bounds the memory used by build().
+        """
+        self.folder_path = folder_path
+        self.facts_file = os.path.join(self.folder_path, "facts.parquet")
+        self.groups_file = os.path.join(self.folder_path, "row_groups.json")
+        self.row_group_size = row_group_size
+        self.row_groups = None
+
+    """-------------------------------"""
+
+    def exists(self) -> bool:
+        if pq is None:
+            return False
+        return os.path.exists(self.facts_file) and os.path.exists(self.groups_file)
+
+    """-------------------------------"""
+
+    def download_archive(self, archive_path: str, headers: dict = None) -> str:
+        """
+        :param headers: Request headers. The SEC requires a User-Agent.
+        :return: Path of the archive.
+        """
+        return get_transport().download(
+            bulk_companyfacts_url, archive_path, headers=headers
+        )
+
+    """-------------------------------"""
+
+    def build(
+        self, archive_path: str, taxonomies: list = None, log_data: bool = True
+    ) -> int:
+        """
+        Build the store from a local copy of the bulk archive. Members are decoded one at a time, so memory stays
+        bounded by the largest company and "row_group_size". The new store replaces the old one once it is complete.
+
+        :param archive_path: Path to companyfacts.zip.
+        :param taxonomies: Taxonomies to keep. Ex: ["us-gaap", "dei"]. None keeps every taxonomy.
+        :return: Number of facts written.
+        """
+        if pq is None:
+            raise ImportError("pyarrow is required to build the fact store.")
+        os.makedirs(self.folder_path, exist_ok=True)
+        temp_facts = f"{self.facts_file}.tmp"
+        buffer = []
+        buffered = 0
+        row_groups = {}
+        group = 0
+        total = 0
+
+        def flush():
+            table = pa.concat_tables([to_table(facts_to_frame(b)) for b in buffer])
+            writer.write_table(table, row_group_size=len(table))
+            buffer.clear()
+
+        with zipfile.ZipFile(archive_path) as archive, pq.ParquetWriter(
+            temp_facts, fact_schema, compression="zstd"
+        ) as writer:
+            for i, name in enumerate(archive.namelist()):
+                # Ex: "CIK0000320193.json"
+                if not name.startswith("CIK") or not name.endswith(".json"):
+                    continue
+                with archive.open(name) as f:
+                    data = json.load(f)
+                columns = parse_company_facts(
+                    data, cik=int(name[3:13]), taxonomies=taxonomies
+                )
+                rows = len(columns["cik"])
+                if rows == 0:
+                    continue
+                buffer.append(columns)
+                buffered += rows
+                total += rows
+                row_groups.setdefault(name[3:13].lstrip("0"), set()).add(group)
+                if buffered >= self.row_group_size:
+                    flush()
+                    buffered = 0
+                    group += 1
+                if log_data and i % 1000 == 0:
+                    print(f"[Fact Store] {i} companies read, {total} facts.")
+            if buffer:
+                flush()
+
+        temp_groups = f"{self.groups_file}.tmp"
+        with open(temp_groups, "w") as f:
+            json.dump({cik: sorted(groups) for cik, groups in row_groups.items()}, f)
+        os.replace(temp_facts, self.facts_file)
+        os.replace(temp_groups, self.groups_file)
+        self.row_groups = None
+        if log_data:
+            print(f"[Fact Store] {total} facts from {len(row_groups)} companies.")
+        return total
+
+    """-------------------------------"""
+
+    def get_facts(self, cik, tags: list = None) -> pd.DataFrame:
+        """
+        :param cik: CIK with or without the leading zeros.
+        :param tags: Tags to keep. None keeps every tag.
+        :return: DataFrame of the company's facts, or None if the company is not in the store.
+        """
+        if self.row_groups is None:
+            with open(self.groups_file) as f:
+                self.row_groups = json.load(f)
+        cik = int(cik)
+        groups = self.row_groups.get(str(cik))
+        if not groups:
+            return None
+        table = pq.ParquetFile(self.facts_file).read_row_groups(groups)
+        mask = pc.equal(table["cik"], cik)
+        if tags is not None:
+            mask = pc.and_(mask, pc.is_in(table["tag"], pa.array(tags)))
+        df = table.filter(mask).to_pandas()
+        for col in ["start", "end", "filed"]:
+            df[col] = pd.to_datetime(df[col])
+        return df
@@ -0,0 +1,239 @@
+# Operating system imports
+import os
+
+# Time and date
+import datetime as dt
+
+# Serialization
+import json
+import zipfile
+
+# Pandas imports
+import pandas as pd
+
+# Parquet imports. Optional, the filing index is unavailable when pyarrow is not installed.
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+
+from FinancialScrapers.Scrapers.http_transport import get_transport
+
+# SEC bulk archive holding the submissions JSON of every company. Updated nightly.
+bulk_submissions_url = (
+    "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+)
+
+filing_columns = ["form", "filingDate", "reportDate", "accessionNumber"]
+
+filing_schema = None
+if pa is not None:
+    filing_schema = pa.schema(
+        [
+            ("cik", pa.int64()),
+            ("form", pa.string()),
+            ("filingDate", pa.date32()),
+            ("reportDate", pa.date32()),
+            ("accessionNumber", pa.string()),
+        ]
+    )
+
+
+class FilingIndex:
+    """
+    Columnar index of every filing in the SEC submissions archive.
+
+    Files:
+        filings.parquet: One row per filing with the columns cik, form, filingDate, reportDate and accessionNumber.
+        row_groups.json: CIK -> row groups of filings.parquet holding its filings.
+        index_info.json: When the index was built, and when the archive it was built from was downloaded.
+
+    The archive holds one JSON file per company, so the rows of a company are written next to each other and a
+    lookup only reads the row groups listed for its CIK.
+    """
+
+    def __init__(self, folder_path: str, row_group_size: int = 100000) -> None:
+        """
+        :param folder_path: Folder holding the index files.
+        :param row_group_size: Rows buffered before they are written. Bounds the memory used by build().
+        """
+        self.folder_path = folder_path
+        self.index_file = os.path.join(self.folder_path, "filings.parquet")
+        self.groups_file = os.path.join(self.folder_path, "row_groups.json")
+        self.info_file = os.path.join(self.folder_path, "index_info.json")
+        self.row_group_size = row_group_size
+        self.row_groups = None
+
+    """-------------------------------"""
+
+    def exists(self) -> bool:
+        if pq is None:
+            return False
+        return os.path.exists(self.index_file) and os.path.exists(self.groups_file)
+
+    """-------------------------------"""
+
+    def download_archive(self, archive_path: str, headers: dict = None) -> str:
+        """
+        Stream the bulk submissions archive to disk. The archive is several gigabytes, so it is never held in memory.
+
+        :param headers: Request headers. The SEC requires a User-Agent.
+        :return: Path of the archive.
+        """
+        return get_transport().download(
+            bulk_submissions_url, archive_path, headers=headers
+        )
+
+    """-------------------------------"""
+
+    def read_member(self, archive: zipfile.ZipFile, name: str):
+        """
+        :param name: Ex: "CIK0000320193.json" or "CIK0000320193-submissions-001.json"
+        :return: (cik, dictionary of filing columns), or None if the member holds no filings.
+        """
+        if not name.startswith("CIK") or not name.endswith(".json"):
+            return None
+        try:
+            cik = int(name[3:13])
+        except ValueError:
+            return None
+        with archive.open(name) as f:
+            data = json.load(f)
+        # The main file nests the filings under "filings" -> "recent". Older filings are in paged files without nesting.
+        if "filings" in data:
+            data = data["filings"].get("recent", {})
+        if not data.get("accessionNumber"):
+            return None
+        return cik, data
+
+    """-------------------------------"""
+
+    def build(
+        self, archive_path: str, forms: list = None, log_data: bool = True
+    ) -> int:
+        """
+        Build the index from a local copy of the bulk archive. Members are decoded one at a time, so memory stays
+        bounded by "row_group_size". The new index replaces the old one only once it is complete.
+
+        :param archive_path: Path to submissions.zip.
+        :param forms: Form types to keep. Ex: ["10-K", "10-Q"]. None keeps every form.
+        :return: Number of filings written.
+        """
+        if pq is None:
+            raise ImportError("pyarrow is required to build the filing index.")
+        os.makedirs(self.folder_path, exist_ok=True)
+        temp_index = f"{self.index_file}.tmp"
+        forms = set(forms) if forms is not None else None
+
+        buffer = {col: [] for col in ["cik"] + filing_columns}
+        row_groups = {}
+        group = 0
+        total = 0
+
+        def flush():
+            frame = pd.DataFrame(buffer)
+            for col in ["filingDate", "reportDate"]:
+                # Filings without a period of report have an empty string.
+                frame[col] = pd.to_datetime(frame[col], errors="coerce").dt.date
+            writer.write_table(
+                pa.Table.from_pandas(frame, schema=filing_schema, preserve_index=False),
+                row_group_size=len(frame),
+            )
+            for col in buffer:
+                buffer[col].clear()
+
+        with zipfile.ZipFile(archive_path) as archive, pq.ParquetWriter(
+            temp_index, filing_schema, compression="zstd"
+        ) as writer:
+            for i, name in enumerate(archive.namelist()):
+                member = self.read_member(archive, name)
+                if member is None:
+                    continue
+                cik, data = member
+                rows = len(data["accessionNumber"])
+                keep = (
+                    range(rows)
+                    if forms is None
+                    else [r for r in range(rows) if data["form"][r] in forms]
+                )
+                if not keep:
+                    continue
+                buffer["cik"].extend([cik] * len(keep))
+                for col in filing_columns:
+                    values = data.get(col) or [""] * rows
+                    buffer[col].extend(values[r] for r in keep)
+                row_groups.setdefault(str(cik), set()).add(group)
+                total += len(keep)
+                if len(buffer["cik"]) >= self.row_group_size:
+                    flush()
+                    group += 1
+                if log_data and i % 10000 == 0:
+                    print(f"[Filing Index] {i} files read, {total} filings.")
+            if buffer["cik"]:
+                flush()
+
+        temp_groups = f"{self.groups_file}.tmp"
+        with open(temp_groups, "w") as f:
+            json.dump({cik: sorted(groups) for cik, groups in row_groups.items()}, f)
+        temp_info = f"{self.info_file}.tmp"
+        with open(temp_info, "w") as f:
+            json.dump(
+                {
+                    "built_at": dt.datetime.now().isoformat(timespec="seconds"),
+                    "archive_date": dt.datetime.fromtimestamp(
+                        os.path.getmtime(archive_path)
+                    ).isoformat(timespec="seconds"),
+                },
+                f,
+            )
+        os.replace(temp_index, self.index_file)
+        os.replace(temp_groups, self.groups_file)
+        os.replace(temp_info, self.info_file)
+        self.row_groups = None
+        if log_data:
+            print(f"[Filing Index] {total} filings from {len(row_groups)} companies.")
+        return total
+
+    """-------------------------------"""
+
+    def get_data_date(self) -> dt.datetime:
+        """
+        :return: When the archive behind the index was downloaded. Filings after this date are not in the index.
+                 Indexes built before "index_info.json" existed use the time the index was written.
+        """
+        try:
+            with open(self.info_file) as f:
+                return dt.datetime.fromisoformat(json.load(f)["archive_date"])
+        except (FileNotFoundError, KeyError, ValueError):
+            return dt.datetime.fromtimestamp(os.path.getmtime(self.index_file))
+
+    """-------------------------------"""
+
+    def get_filings(self, cik, form: str = None) -> pd.DataFrame:
+        """
+        :param cik: CIK with or without the leading zeros.
+        :param form: Form type to keep. Ex: "10-K". None for every form.
+        :return: DataFrame with the columns form, filingDate, reportDate and accessionNumber, newest first.
+                 Dates are strings (Ex: "2023-09-30") like the submissions JSON.
+        """
+        if self.row_groups is None:
+            with open(self.groups_file) as f:
+                self.row_groups = json.load(f)
+        cik = int(cik)
+        groups = self.row_groups.get(str(cik), [])
+        if not groups:
+            return pd.DataFrame(columns=filing_columns)
+
+        table = pq.ParquetFile(self.index_file).read_row_groups(groups)
+        filings = table.filter(pc.equal(table["cik"], cik)).to_pandas()
+        if form is not None:
+            filings = filings[filings["form"] == form]
+        filings = filings.sort_values("filingDate", ascending=False, kind="stable")
+        for col in ["filingDate", "reportDate"]:
+            filings[col] = pd.to_datetime(filings[col]).dt.strftime("%Y-%m-%d")
+            filings[col] = filings[col].fillna("")
+        return filings[filing_columns].reset_index(drop=True)
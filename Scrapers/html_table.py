@@ -0,0 +1,84 @@
+# Standard library html parser. Used to read tables from page source without a browser round trip per cell.
+from html.parser import HTMLParser
+
+
+class TableParser(HTMLParser):
+    """
+    Collects the text of every <table> in a document.
+
+    After feed(), "tables" holds one dictionary per table with the keys:
+        headers: Text of the <th> cells in the first row of <thead>.
+        rows: List of rows from <tbody>. Each row is a list with the text of its <td> cells.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self.table = None
+        self.section = None
+        self.row = None
+        self.cell = None
+        self.depth = 0
+        self.header_rows = 0
+
+    """-------------------------------"""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.depth += 1
+            # Nested tables are read as part of the outer table's cells.
+            if self.depth == 1:
+                self.table = {"headers": [], "rows": []}
+                self.header_rows = 0
+            return
+        if self.table is None or self.depth != 1:
+            return
+        if tag in ("thead", "tbody"):
+            self.section = tag
+        elif tag == "tr":
+            self.row = []
+            if self.section == "thead":
+                self.header_rows += 1
+        elif tag in ("td", "th") and self.row is not None:
+            self.cell = []
+
+    """-------------------------------"""
+
+    def handle_endtag(self, tag):
+        if tag == "table":
+            if self.depth == 1 and self.table is not None:
+                self.tables.append(self.table)
+                self.table = None
+            self.depth = max(self.depth - 1, 0)
+            return
+        if self.table is None or self.depth != 1:
+            return
+        if tag in ("td", "th") and self.cell is not None and self.row is not None:
+            self.row.append(" ".join("".join(self.cell).split()))
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            if self.section == "thead":
+                if self.header_rows == 1:
+                    self.table["headers"] = self.row
+            elif self.row:
+                self.table["rows"].append(self.row)
+            self.row = None
+        elif tag in ("thead", "tbody"):
+            self.section = None
+
+    """-------------------------------"""
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def parse_tables(html: str) -> list:
+    """
+    :param html: Page source.
+    :return: List of tables. See TableParser for the format.
+    """
+    parser = TableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tables
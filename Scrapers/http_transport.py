@@ -0,0 +1,125 @@
+# Operating system imports
+import os
+
+# Threading
+import threading
+from urllib.parse import urlparse
+
+# Requests imports
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpTransport:
+    """
+    Shared HTTP layer for the scrapers. Connections are kept alive and reused per host,
+    responses are requested gzip compressed, and each host has a limit on concurrent requests.
+    """
+
+    def __init__(
+        self,
+        timeout: tuple = (5, 30),
+        max_connections: int = 10,
+        max_per_host: int = 4,
+        headers: dict = None,
+    ) -> None:
+        """
+        :param timeout: (connect, read) timeout in seconds, used when a request does not pass its own.
+        :param max_connections: Connections kept open for each host.
+        :param max_per_host: Requests allowed to run against the same host at the same time.
+        :param headers: Headers sent with every request.
+        """
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_connections, pool_maxsize=max_connections
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        if headers is not None:
+            self.session.headers.update(headers)
+        self.host_limits = {}
+        self.lock = threading.Lock()
+
+    """-------------------------------"""
+
+    def get_host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_limits[host]
+
+    """-------------------------------"""
+
+    def get(
+        self,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        timeout=None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        :param url: Url to request.
+        :param params: Query parameters.
+        :param headers: Extra headers for this request only.
+        :param timeout: Overrides the default timeout.
+        :param stream: If True, the body is not downloaded until it is read. The host slot is released once the
+                       headers arrive, use download() for bodies that should count against the host limit.
+        :return: The response.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        with self.get_host_limit(url):
+            return self.session.get(
+                url, params=params, headers=headers, timeout=timeout, stream=stream
+            )
+
+    """-------------------------------"""
+
+    def download(
+        self,
+        url: str,
+        file_path: str,
+        headers: dict = None,
+        timeout=(5, 300),
+        chunk_size: int = 2**20,
+    ) -> str:
+        """
+        Stream a response to disk, so large files are never held in memory. The file only appears once it is complete.
+
+        :return: Path of the file.
+        """
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        temp_path = f"{file_path}.tmp"
+        # The host slot is held until the whole body is read, so downloads count against the host limit.
+        with self.get_host_limit(url), self.session.get(
+            url, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            with open(temp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        os.replace(temp_path, file_path)
+        return file_path
+
+    """-------------------------------"""
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# Transport shared by every scraper, so connections to the same host are reused across scrapers.
+shared_transport = None
+shared_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    global shared_transport
+    with shared_transport_lock:
+        if shared_transport is None:
+            shared_transport = HttpTransport()
+        return shared_transport
@@ -5,6 +5,12 @@ import sys
 # Time & Date imports
 import time
 
+# Parsing imports
+import io
+
+# Threading
+from concurrent.futures import ThreadPoolExecutor
+
 cwd = os.getcwd()
 path = os.path.join(cwd, "FinancialScrapers\\Scrapers")
 sys.path.append(path)
@@ -14,10 +20,13 @@ import pandas as pd
 
 # Requests imports
 import requests
+from FinancialScrapers.Scrapers.http_transport import get_transport
+from FinancialScrapers.Scrapers.html_table import parse_tables
+from FinancialScrapers.Scrapers.driver_pool import get_driver_pool
+from FinancialScrapers.Scrapers.browser_profile import user_agent
 
 # Selenium imports
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -26,10 +35,42 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 # Your path to chrome driver executable.
 chrome_driver = os.getenv("chrome_driver_path")
-""" --- Chrome driver options ---"""
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-gpu")
+
+# Browser-like headers, some sites refuse the default requests user agent.
+http_headers = {
+    "User-Agent": user_agent,
+}
+fred_csv_url = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+
+# FRED series kept in the macro store. Adding a series only needs an entry here.
+#   series_id: FRED series id.
+#   column: Name of the value column in the stored csv.
+#   monthly: Monthly series are stored with "YYYY-M" dates, others with "YYYY-MM-DD".
+#   precision: Optional. Decimals kept in the stored csv. Series without it are stored at full precision.
+fred_series = {
+    "fed_funds": {
+        "series_id": "FEDFUNDS",
+        "column": "Rate",
+        "monthly": True,
+        "precision": 2,
+    },
+    "treasury_yield_spread": {
+        "series_id": "T10Y2YM",
+        "column": "Rate",
+        "monthly": True,
+        "precision": 2,
+    },
+}
+
+
+def get_series_config(name: str) -> dict:
+    """
+    :param name: Key of "fred_series", or any FRED series id. Ex: "fed_funds" or "DGS10"
+    :return: Entry of "fred_series". Series ids without an entry keep their observation dates and a "Value" column.
+    """
+    if name in fred_series:
+        return fred_series[name]
+    return {"series_id": name, "column": "Value", "monthly": False}
 
 
 # Pandas imports
@@ -44,7 +85,15 @@ t10_t2_notes_path = f"{cwd}\\Database\\MacroData\\Treasury_Yield_Spread_10Y_2Y\\
 class MacroScraper:
     wait_time = 5
 
-    def __init__(self):
+    def __init__(self, driver_path: str = None, browser_profile: str = "fast"):
+        """
+        :param driver_path: Path to the chrome driver executable. Defaults to the "chrome_driver_path" environment variable.
+        :param browser_profile: Chrome profile used when a browser is needed. "visible", "headless" or "fast".
+        """
+        self.chrome_driver = driver_path if driver_path is not None else chrome_driver
+        self.browser_profile = browser_profile
+        # Driver checked out of the shared pool. None while no page is open.
+        self.browser = None
         self.cpi_url = "https://www.rateinflation.com/inflation-rate/usa-historical-inflation-rate/"
         self.fed_funds_url = "https://fred.stlouisfed.org/series/FEDFUNDS"
         self.t10_t2_url = "https://fred.stlouisfed.org/series/T10Y2Y"
@@ -71,103 +120,111 @@ class MacroScraper:
 
     """-----------------------------------"""
 
-    def get_cpi(self):
+    def get_cpi(self, source: str = "table") -> pd.DataFrame:
         """
-        Scrape the CPI data from the "CPI url".
+        Read the CPI data. The whole table is parsed in one pass and reshaped into a monthly series.
+
+        :param source: "table" for the inflation table on the "CPI url". "fred" to compute the same series from the
+                       FRED CPIAUCSL csv, without a browser.
+        :return: DataFrame with the columns "Date" (Ex: 2023-9) and "CPI_val", newest entries on top.
         """
+        if source == "fred":
+            return self.get_cpi_fred()
 
-        if self.browser == None:
-            self.create_browser(url=self.cpi_url)
+        table = self.read_cpi_table()
+        if table is None:
+            print(f"[Error] CPI table not found at {self.cpi_url}")
+            return pd.DataFrame(columns=["Date", "CPI_val"])
+        return self.reshape_cpi_table(table["rows"])
 
-        # Index should start at 1.
-        index = 1
-
-        year_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[1]"
-        jan_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[2]"
-        feb_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[3]"
-        mar_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[4]"
-        apr_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[5]"
-        may_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[6]"
-        jun_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[7]"
-        jul_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[8]"
-        aug_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[9]"
-        sep_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[10]"
-        oct_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[11]"
-        nov_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[12]"
-        dec_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[13]"
-        annual_xpath = "/html/body/div/div/div[2]/main/div[3]/table/tbody/tr[{}]/td[14]"
-
-        scraping_cpi = True
-
-        cpi_data = []
-        # cpi_dict = {}
-        error_count = 0
-        error_threshold = 3
-
-        while scraping_cpi:
+    """-----------------------------------"""
+
+    def read_cpi_table(self):
+        """
+        Fetch the CPI page over HTTP and parse its table. The browser is only opened if the page cannot be parsed,
+        and then the page source is read once instead of cell by cell.
+
+        :return: Dictionary with the "headers" and "rows" of the table, or None if it was not found.
+        """
+        html = None
+        try:
+            response = get_transport().get(self.cpi_url, headers=http_headers)
+            if response.status_code == 200:
+                html = response.text
+        except requests.RequestException as e:
+            print(f"[read_cpi_table()] {e}")
+        table = self.find_cpi_table(html) if html is not None else None
+        if table is None:
+            self.create_browser(url=self.cpi_url)
             try:
-                year = self.read_data(xpath=year_xpath.format(index))
-                jan_data = self.read_data(xpath=jan_xpath.format(index))
-                feb_data = self.read_data(xpath=feb_xpath.format(index))
-                mar_data = self.read_data(xpath=mar_xpath.format(index))
-                apr_data = self.read_data(xpath=apr_xpath.format(index))
-                may_data = self.read_data(xpath=may_xpath.format(index))
-                jun_data = self.read_data(xpath=jun_xpath.format(index))
-                jul_data = self.read_data(xpath=jul_xpath.format(index))
-                aug_data = self.read_data(xpath=aug_xpath.format(index))
-                sep_data = self.read_data(xpath=sep_xpath.format(index))
-                oct_data = self.read_data(xpath=oct_xpath.format(index))
-                nov_data = self.read_data(xpath=nov_xpath.format(index))
-                dec_data = self.read_data(xpath=dec_xpath.format(index))
-                annual_data = self.read_data(xpath=annual_xpath.format(index))
-
-                # Create a list holding the data.
-                data_vars = [
-                    jan_data,
-                    feb_data,
-                    mar_data,
-                    apr_data,
-                    may_data,
-                    jun_data,
-                    jul_data,
-                    aug_data,
-                    sep_data,
-                    oct_data,
-                    nov_data,
-                    dec_data,
-                ]
-
-                # Create an empty dictionary to hold the cpi data for the year.
-                cpi_dict = {}
-                for i in range(len(data_vars)):
-                    if data_vars[i].strip() == "":
-                        data_vars[i] = "N\A"
-
-                    if "%" in data_vars[i]:
-                        data_vars[i] = data_vars[i].replace("%", "")
-
-                    # Assign data to the dictionary
-                    month = (
-                        len(data_vars) - i
-                    )  # Logic to determine the month. The length of "data_vars" should always be 12, so we use i to work down the list. Ex: Iter1: 12 - 0, Iter2: 12-1, Iter3: 12-2. We do this because we want the data to be stored in the dict in reverese.
-                    cpi_dict[f"{year}-{month}"] = data_vars[month - 1]
-
-            except NoSuchElementException:
-                error_count += 1
-
-            if error_count == error_threshold:
-                scraping_cpi = False
-
-            cpi_data.append(cpi_dict)
-
-            index += 1
-        # Create a DataFrame
-        cpi_df = pd.DataFrame(
-            [(k, v) for d in cpi_data for k, v in d.items()],
-            columns=["Date", "CPI_val"],
+                WebDriverWait(self.browser, self.wait_time).until(
+                    EC.presence_of_element_located((By.XPATH, "//main//table"))
+                )
+                html = self.browser.page_source
+            except TimeoutException:
+                html = ""
+            finally:
+                self.release_browser()
+            table = self.find_cpi_table(html)
+        return table
+
+    """-----------------------------------"""
+
+    def find_cpi_table(self, html: str):
+        # Year, January - December, Annual.
+        tables = [
+            t for t in parse_tables(html) if t["rows"] and len(t["rows"][0]) >= 13
+        ]
+        if not tables:
+            return None
+        return max(tables, key=lambda t: len(t["rows"]))
+
+    """-----------------------------------"""
+
+    def reshape_cpi_table(self, rows: list) -> pd.DataFrame:
+        """
+        :param rows: Rows of the CPI table. Ex: ["2023", "6.4%", "6.0%", ..., "4.1%"]
+        :return: DataFrame with one row per month.
+        """
+        months = list(range(1, 13))
+        # The 14th column is the annual average, which is not part of the monthly series.
+        table = pd.DataFrame(
+            [row[:13] for row in rows if len(row) >= 13], columns=["Year"] + months
         )
+        table = table[table["Year"].str.fullmatch(r"\d{4}")]
+        cpi_df = table.melt(id_vars="Year", var_name="Month", value_name="CPI_val")
+        cpi_df["CPI_val"] = (
+            cpi_df["CPI_val"].str.replace("%", "", regex=False).str.strip()
+        )
+        # Months that have not been published yet are blank.
+        cpi_df = cpi_df[cpi_df["CPI_val"] != ""]
+        cpi_df = cpi_df.astype({"Year": int, "Month": int})
+        cpi_df = cpi_df.sort_values(["Year", "Month"], ascending=False)
+        cpi_df["Date"] = cpi_df["Year"].astype(str) + "-" + cpi_df["Month"].astype(str)
+        return cpi_df[["Date", "CPI_val"]].reset_index(drop=True)
+
+    """-----------------------------------"""
 
-        return cpi_df
+    def get_cpi_fred(self, series_id: str = "CPIAUCSL") -> pd.DataFrame:
+        """
+        Build the inflation series from the FRED consumer price index csv. The rate is the change from the same
+        month a year earlier, which is how the "CPI url" table reports it.
+
+        :param series_id: FRED series of the index level.
+        :return: DataFrame with the same format as get_cpi.
+        """
+        data = self.fetch_series(series_id).set_index("Date").asfreq("MS")
+        rate = (data["Value"].pct_change(12, fill_method=None) * 100).dropna()
+        cpi_df = pd.DataFrame(
+            {
+                "Date": rate.index.year.astype(str)
+                + "-"
+                + rate.index.month.astype(str),
+                "CPI_val": rate.map("{:.1f}".format).to_numpy(),
+            }
+        )
+        # Reverse the rows so the newest entries are on top.
+        return cpi_df[::-1].reset_index(drop=True)
 
     """ ---------------------- Fed Funds ---------------------- """
     """
@@ -178,9 +235,7 @@ class MacroScraper:
     """-----------------------------------"""
 
     def update_fed_funds(self, path_to_update: str):
-        rates_df = self.get_fed_funds()
-        # Write the dataframe to the csv file.
-        rates_df.to_csv(path_to_update, index=False)
+        self.update_series("fed_funds", path_to_update)
 
     """-----------------------------------"""
 
@@ -189,38 +244,8 @@ class MacroScraper:
 
     """-----------------------------------"""
 
-    def get_fed_funds(self):
-        csv_file_link = "https://fred.stlouisfed.org/graph/fredgraph.csv?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1319&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=FEDFUNDS&scale=left&cosd=1954-07-01&coed=2023-09-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Monthly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2023-10-05&revision_date=2023-10-05&nd=1954-07-01"
-        csv_data = requests.get(csv_file_link)
-
-        # Decode to a string.
-        csv_content = csv_data.content.decode("utf-8").split("\n")
-
-        prev_year = None
-
-        data_collected = []
-        yearly_data = {}
-
-        for c in csv_content:
-            if c == "DATE,FEDFUNDS" or c == "":
-                pass
-            else:
-                try:
-                    date, value = c.split(",")
-                    year, month, day = date.split("-")
-                    formatted_date = f"{year}-{int(month)}"
-                    data_collected.append((formatted_date, float(value)))
-                # Occurs when trying to split blank value.
-                except ValueError:
-                    pass
-
-        df = pd.DataFrame(data_collected, columns=["Date", "Rate"])
-        # Convert rate column to properly display the rate. Previously {:,2f} would be displayed. Still haven't figured out why.
-        df["Rate"] = df["Rate"].apply(lambda x: f"{x:.2f}")
-        # Reverse the rows so the newest entries are on top.
-        df = df[::-1]
-        df.reset_index(drop=True, inplace=True)
-        return df
+    def get_fed_funds(self) -> pd.DataFrame:
+        return self.get_series("fed_funds")
 
     """-----------------------------------"""
 
@@ -240,46 +265,162 @@ class MacroScraper:
     """-----------------------------------"""
 
     def update_treasury_yield_spread(self, path_to_update: str):
-        treasury_df = self.get_treasury_yield_spread()
-        treasury_df.to_csv(path_to_update, index=False)
+        self.update_series("treasury_yield_spread", path_to_update)
 
     def get_treasury_yield_spread(self) -> pd.DataFrame:
-        csv_file_link = "https://fred.stlouisfed.org/graph/fredgraph.csv?bgcolor=%23e1e9f0&chart_type=line&drp=0&fo=open%20sans&graph_bgcolor=%23ffffff&height=450&mode=fred&recession_bars=on&txtcolor=%23444444&ts=12&tts=12&width=1318&nt=0&thu=0&trc=0&show_legend=yes&show_axis_titles=yes&show_tooltip=yes&id=T10Y2YM&scale=left&cosd=1976-06-01&coed=2023-09-01&line_color=%234572a7&link_values=false&line_style=solid&mark_type=none&mw=3&lw=2&ost=-99999&oet=99999&mma=0&fml=a&fq=Monthly&fam=avg&fgst=lin&fgsnd=2020-02-01&line_index=1&transformation=lin&vintage_date=2023-10-14&revision_date=2023-10-14&nd=1976-06-01"
-        csv_data = requests.get(csv_file_link)
-
-        # Decode to a string.
-        csv_content = csv_data.content.decode("utf-8").split("\n")
-        prev_year = None
-
-        data_collected = []
-        yearly_data = {}
-
-        for c in csv_content:
-            if c == "DATE,T10Y2Y" or c == "":
-                pass
-            else:
-                try:
-                    date, value = c.split(",")
-                    year, month, day = date.split("-")
-                    formatted_date = f"{year}-{int(month)}"
-                    data_collected.append((formatted_date, float(value)))
-                # Occurs when trying to split blank value.
-                except ValueError:
-                    pass
-
-        df = pd.DataFrame(data_collected, columns=["Date", "Rate"])
-        # Convert rate column to properly display the rate. Previously {:,2f} would be displayed. Still haven't figured out why.
-        df["Rate"] = df["Rate"].apply(lambda x: f"{x:.2f}")
-        # Reverse the rows so the newest entries are on top.
-        df = df[::-1]
-        df.reset_index(drop=True, inplace=True)
-        return df
+        return self.get_series("treasury_yield_spread")
 
     """-----------------------------------"""
 
     def get_treasury_yield_source(self) -> str:
         return self.t10_t2_url
 
+    """ ---------------------- FRED Series ---------------------- """
+    """-----------------------------------"""
+
+    def fetch_series(self, series_id: str, start=None) -> pd.DataFrame:
+        """
+        :param series_id: FRED series id. Ex: "FEDFUNDS"
+        :param start: Only return observations on or after this date. None for the whole history.
+        :return: DataFrame with the columns "Date" (datetime64) and "Value", oldest first.
+        """
+        params = {"id": series_id}
+        if start is not None:
+            params["cosd"] = pd.Timestamp(start).strftime("%Y-%m-%d")
+        csv_data = get_transport().get(fred_csv_url, params=params)
+        if csv_data.status_code != 200:
+            print(f"[Error] FRED series {series_id}: {csv_data.status_code}")
+            return pd.DataFrame(columns=["Date", "Value"])
+        # Missing observations are written as ".".
+        df = pd.read_csv(io.StringIO(csv_data.text), na_values=".")
+        # The date column is named "DATE" or "observation_date" depending on the FRED endpoint.
+        df.columns = ["Date", "Value"]
+        df["Date"] = pd.to_datetime(df["Date"])
+        return df.dropna().reset_index(drop=True)
+
+    """-----------------------------------"""
+
+    def get_series(self, name: str, path: str = None) -> pd.DataFrame:
+        """
+        Get a series from "fred_series". If "path" holds a stored copy, only the observations after its last date
+        are requested and merged into it.
+
+        :param name: Key of "fred_series". Ex: "fed_funds"
+        :param path: Csv file of the stored series.
+        :return: DataFrame with the columns "Date" and the series' column, newest entries on top.
+        """
+        config = get_series_config(name)
+        column = config["column"]
+        stored = None
+        if path is not None and os.path.exists(path):
+            stored = self.read_series(path, config)
+        # The last stored observation is requested again, in case it was revised.
+        start = (
+            stored["Date"].max() if stored is not None and not stored.empty else None
+        )
+        new_data = self.fetch_series(config["series_id"], start=start)
+        new_data = new_data.rename(columns={"Value": column})
+        if stored is None and new_data.empty:
+            return pd.DataFrame(columns=["Date", column])
+        if stored is not None:
+            new_data = pd.concat([stored, new_data]).drop_duplicates(
+                "Date", keep="last"
+            )
+        df = new_data.sort_values("Date", ascending=False)
+        if config.get("precision") is not None:
+            df[column] = df[column].round(config["precision"])
+        df["Date"] = self.format_series_dates(df["Date"], config)
+        return df.reset_index(drop=True)
+
+    """-----------------------------------"""
+
+    def update_series(self, name: str, path_to_update: str) -> bool:
+        """
+        :return: False if nothing could be fetched. The stored file is left as it is.
+        """
+        df = self.get_series(name, path_to_update)
+        if df.empty:
+            print(f"[Warning] No data for FRED series {name}")
+            return False
+        os.makedirs(os.path.dirname(path_to_update) or ".", exist_ok=True)
+        # Written to a temporary file first, so readers never see a partial file.
+        temp_path = f"{path_to_update}.tmp"
+        precision = get_series_config(name).get("precision")
+        float_format = f"%.{precision}f" if precision is not None else None
+        df.to_csv(temp_path, index=False, float_format=float_format)
+        os.replace(temp_path, path_to_update)
+        return True
+
+    """-----------------------------------"""
+
+    def update_many(
+        self, paths: dict, max_workers: int = 8, recheck_hours: float = 12
+    ) -> list:
+        """
+        Refresh many FRED series at once. Stale series are fetched concurrently over the shared transport,
+        and each file is replaced as soon as its own download is merged.
+
+        :param paths: Series -> csv file. Series are keys of "fred_series" or FRED series ids. Ex: {"DGS10": "..."}
+        :param max_workers: Series fetched at the same time. The transport still limits the requests per host.
+        :param recheck_hours: See is_series_stale.
+        :return: Series that were updated.
+        """
+        stale = [
+            name
+            for name, path in paths.items()
+            if self.is_series_stale(name, path, recheck_hours=recheck_hours)
+        ]
+
+        def run(name):
+            try:
+                return name if self.update_series(name, paths[name]) else None
+            except requests.RequestException as e:
+                print(f"[Error] FRED series {name}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            updated = [name for name in executor.map(run, stale) if name is not None]
+        return updated
+
+    """-----------------------------------"""
+
+    def is_series_stale(self, name: str, path: str, recheck_hours: float = 12) -> bool:
+        """
+        A series is stale when its file is missing, or when a newer observation is due and the file was not
+        refreshed in the last "recheck_hours". The second condition avoids requesting a series again and again
+        while its next observation is not published yet.
+        """
+        if not os.path.exists(path):
+            return True
+        if time.time() - os.path.getmtime(path) < recheck_hours * 3600:
+            return False
+        config = get_series_config(name)
+        stored = self.read_series(path, config)
+        if stored.empty:
+            return True
+        # Monthly observations are dated on the first day of the month and published the month after.
+        due_days = 62 if config.get("monthly", False) else 1
+        return (pd.Timestamp.now() - stored["Date"].max()).days > due_days
+
+    """-----------------------------------"""
+
+    def read_series(self, path: str, config: dict) -> pd.DataFrame:
+        """
+        :return: The stored series with "Date" parsed to datetime64.
+        """
+        df = pd.read_csv(path)
+        date_format = "%Y-%m" if config.get("monthly", False) else "%Y-%m-%d"
+        df["Date"] = pd.to_datetime(df["Date"], format=date_format)
+        return df
+
+    """-----------------------------------"""
+
+    def format_series_dates(self, dates: pd.Series, config: dict) -> pd.Series:
+        # Monthly series are stored as "YYYY-M". Ex: 2023-9
+        if config.get("monthly", False):
+            return dates.dt.year.astype(str) + "-" + dates.dt.month.astype(str)
+        return dates.dt.strftime("%Y-%m-%d")
+
     """----------------------------------- Browser Utilities -----------------------------------"""
     """-----------------------------------"""
 
@@ -363,8 +504,11 @@ class MacroScraper:
         :param url: The website to visit.
         :return: None
         """
-        service = Service(executable_path=chrome_driver)
-        self.browser = webdriver.Chrome(service=service, options=chrome_options)
+        # Reuse a driver from the shared pool instead of launching Chrome for every page.
+        self.release_browser()
+        self.browser = get_driver_pool(
+            self.chrome_driver, self.browser_profile
+        ).checkout()
         # Default browser route
         if url == None:
             self.browser.get(url=self.sec_annual_url)
@@ -374,6 +518,16 @@ class MacroScraper:
 
     """-----------------------------------"""
 
+    def release_browser(self) -> None:
+        """
+        Return the driver to the shared pool.
+        """
+        if self.browser is not None:
+            browser, self.browser = self.browser, None
+            get_driver_pool(self.chrome_driver, self.browser_profile).checkin(browser)
+
+    """-----------------------------------"""
+
     def scroll_page(
         self,
         pixel_to_scroll: int = 500,
@@ -0,0 +1,185 @@
+# Time & Date imports
+import time
+
+# Threading
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+
+class RequestScheduler:
+    """
+    Runs requests one at a time, as fast as the quotas allow.
+
+    Quotas are tracked with rolling windows (Ex: the last 60 seconds), so a burst never goes over a quota
+    in any window. Pending requests wait in a priority queue, lower numbers run first, and requests with the
+    same priority run in the order they were submitted. Throttled requests are put back in the queue and the
+    scheduler backs off, so nothing is dropped. Requests that would wait longer than "max_wait" for a slot fail
+    with a TimeoutError instead of blocking. Ex: the daily quota is used up.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 5,
+        requests_per_day: int = None,
+        backoff: float = 60,
+        max_retries: int = 5,
+        max_wait: float = None,
+    ) -> None:
+        """
+        :param requests_per_minute: Maximum requests in any 60 second window.
+        :param requests_per_day: Maximum requests in any 24 hour window. None for no daily quota.
+        :param backoff: Seconds to wait after the first throttled response. Doubles on each throttle in a row.
+        :param max_retries: Attempts for a single request before its last response is returned as is.
+        :param max_wait: Longest wait in seconds for a slot. None to always wait.
+        """
+        self.windows = [(60, requests_per_minute)]
+        if requests_per_day:
+            self.windows.append((86400, requests_per_day))
+        self.history = deque()
+        self.backoff = backoff
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.worker = None
+        self.paused_until = 0
+        self.consecutive_throttles = 0
+
+        # Statistics
+        self.started = None
+        self.completed = 0
+        self.throttled = 0
+
+    """-------------------------------"""
+
+    def submit(
+        self, func, *args, priority: int = 10, is_throttled=None, **kwargs
+    ) -> Future:
+        """
+        :param func: Function that sends the request.
+        :param priority: Lower numbers run first.
+        :param is_throttled: Function that receives the result of "func" and returns True if it was a throttle response.
+        :return: Future holding the result of "func".
+        """
+        future = Future()
+        task = (func, args, kwargs, is_throttled, future, 0)
+        with self.condition:
+            heapq.heappush(self.queue, (priority, next(self.counter), task))
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.run, daemon=True)
+                self.worker.start()
+            self.condition.notify()
+        return future
+
+    """-------------------------------"""
+
+    def call(self, func, *args, priority: int = 10, is_throttled=None, **kwargs):
+        """
+        Blocking version of submit.
+        """
+        return self.submit(
+            func, *args, priority=priority, is_throttled=is_throttled, **kwargs
+        ).result()
+
+    """-------------------------------"""
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.queue:
+                    # Stop the worker once the queue stays empty. A new one is started by submit.
+                    if not self.condition.wait(timeout=30):
+                        if not self.queue:
+                            self.worker = None
+                            return
+                priority, order, task = heapq.heappop(self.queue)
+
+            func, args, kwargs, is_throttled, future, attempt = task
+            # Retried requests are already marked as running.
+            if attempt == 0 and not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self.wait_for_slot()
+            except TimeoutError as e:
+                future.set_exception(e)
+                continue
+            self.history.append(time.time())
+            if self.started is None:
+                self.started = time.time()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            if is_throttled is not None and is_throttled(result):
+                self.throttled += 1
+                self.consecutive_throttles += 1
+                delay = self.backoff * 2 ** (self.consecutive_throttles - 1)
+                self.paused_until = time.time() + delay
+                print(f"[Throttled] Backing off for {delay:.0f} seconds.")
+                if attempt + 1 < self.max_retries:
+                    # Put the request back at the front of its priority level.
+                    retry = (func, args, kwargs, is_throttled, future, attempt + 1)
+                    with self.condition:
+                        heapq.heappush(self.queue, (priority, order, retry))
+                    continue
+            else:
+                self.consecutive_throttles = 0
+            self.completed += 1
+            future.set_result(result)
+
+    """-------------------------------"""
+
+    def wait_for_slot(self) -> None:
+        """
+        Sleep until a request can be sent without going over any quota.
+        Raises TimeoutError when the wait is longer than "max_wait".
+        """
+        while True:
+            now = time.time()
+            wait = self.paused_until - now
+            longest_window = max(window for window, limit in self.windows)
+            while self.history and now - self.history[0] >= longest_window:
+                self.history.popleft()
+            for window, limit in self.windows:
+                in_window = [t for t in self.history if now - t < window]
+                if len(in_window) >= limit:
+                    # The slot frees up when the oldest request in the window expires.
+                    wait = max(wait, in_window[-limit] + window - now)
+            if wait <= 0:
+                return
+            if self.max_wait is not None and wait > self.max_wait:
+                raise TimeoutError(
+                    f"Request quota used up. The next slot opens in {wait:.0f} seconds, longer than {self.max_wait:.0f}."
+                )
+            # Waits for the per minute quota are routine. Anything longer means a larger quota is used up.
+            if wait > 60:
+                print(f"[Warning] Request quota used up. Waiting {wait:.0f} seconds.")
+            time.sleep(wait)
+
+    """-------------------------------"""
+
+    def get_rate(self) -> float:
+        """
+        :return: Requests per minute achieved since the first request.
+        """
+        if self.started is None:
+            return 0.0
+        elapsed = max(time.time() - self.started, 1e-9)
+        return self.completed / elapsed * 60
+
+    """-------------------------------"""
+
+    def stats(self) -> dict:
+        return {
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "pending": len(self.queue),
+            "requests_per_minute": round(self.get_rate(), 2),
+        }
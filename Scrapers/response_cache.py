@@ -0,0 +1,97 @@
+# Operating system imports
+import os
+
+# Time & Date imports
+import time
+
+# Serialization
+import gzip
+import hashlib
+import json
+
+# Seconds a cached response stays valid for each Alpha Vantage function. Functions not listed use "default".
+default_ttls = {
+    "default": 86400,
+    "EARNINGS": 86400,
+    "INCOME_STATEMENT": 7 * 86400,
+    "BALANCE_SHEET": 7 * 86400,
+    "CASH_FLOW": 7 * 86400,
+}
+
+
+class ResponseCache:
+    """
+    On-disk cache for raw JSON responses. Entries are gzip compressed and stored by a hash of the request,
+    Ex: {folder_path}\\EARNINGS\\{hash}.json.gz
+    """
+
+    def __init__(
+        self, folder_path: str, ttls: dict = None, offline: bool = False
+    ) -> None:
+        """
+        :param folder_path: Folder holding the cached responses.
+        :param ttls: Overrides for the TTL of each function, in seconds.
+        :param offline: If True, cached responses never expire and nothing is requested from the web.
+        """
+        self.folder_path = folder_path
+        self.ttls = dict(default_ttls)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.offline = offline
+
+    """-------------------------------"""
+
+    def get_key(self, function: str, params: dict) -> str:
+        """
+        :param params: Request parameters. The api key is left out, so changing keys does not empty the cache.
+        """
+        params = {k: str(v) for k, v in params.items() if k != "apikey"}
+        params["function"] = function
+        payload = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    """-------------------------------"""
+
+    def get_path(self, function: str, params: dict) -> str:
+        return os.path.join(
+            self.folder_path, function, f"{self.get_key(function, params)}.json.gz"
+        )
+
+    """-------------------------------"""
+
+    def get(self, function: str, params: dict):
+        """
+        :return: The cached JSON, or None if there is no valid entry.
+        """
+        path = self.get_path(function, params)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+        ttl = self.ttls.get(function, self.ttls["default"])
+        if not self.offline and age > ttl:
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Corrupt or partially written entry.
+            return None
+
+    """-------------------------------"""
+
+    def put(self, function: str, params: dict, data) -> None:
+        path = self.get_path(function, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    """-------------------------------"""
+
+    def invalidate(self, function: str, params: dict) -> None:
+        try:
+            os.remove(self.get_path(function, params))
+        except OSError:
+            pass
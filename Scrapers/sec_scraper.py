@@ -1,36 +1,369 @@
-import requests
+import os
+
+# Serialization
+import gzip
+import json
+
+# Time and date
+import datetime as dt
+
+# Threading
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from FinancialScrapers.Scrapers.http_transport import get_transport
+from FinancialScrapers.Scrapers.response_cache import ResponseCache
+from FinancialScrapers.Scrapers.filing_index import FilingIndex
+from FinancialScrapers.Scrapers.fact_store import (
+    FactStore,
+    build_statement,
+    facts_to_frame,
+    parse_company_facts,
+    statement_tags,
+)
+
+# The SEC asks for a User-Agent that identifies who is making the requests. Ex: "Company Name admin@company.com"
+sec_headers = {"User-Agent": os.getenv("sec_user_agent", "FinancialScrapers")}
+
+submissions_url = "https://data.sec.gov/submissions/CIK{}.json"
+companyfacts_url = "https://data.sec.gov/api/xbrl/companyfacts/CIK{}.json"
+
+# Days between two filings of a form. Once the latest indexed filing is older, a newer one is due and the
+# company's submissions are read instead of the filing index.
+filing_intervals = {"10-K": 365, "10-Q": 92}
+
 
 class SecScraper:
-    def __init__(self, folder_path: str) -> None:
+    def __init__(
+        self, folder_path: str, offline: bool = False, index_max_age: int = 7
+    ) -> None:
+        """
+        :param folder_path: Folder holding "cik_data.csv". Submissions are cached in a "Submissions" folder inside of it.
+        :param offline: Only serve submissions from the cache.
+        :param index_max_age: Days the filing index is used for after its archive was downloaded.
+        """
         self.folder_path = folder_path
-        self.cik_file = f"{self.folder_path}\\cik_data.csv"
+        self.cik_file = os.path.join(self.folder_path, "cik_data.csv")
+        # Submissions are cached on disk for a day, and in memory for the life of the scraper.
+        self.response_cache = ResponseCache(
+            os.path.join(self.folder_path, "Submissions"), offline=offline
+        )
+        self.submissions = {}
+        # Local index of every filing, built from the bulk submissions archive.
+        self.filing_index = FilingIndex(os.path.join(self.folder_path, "FilingIndex"))
+        self.index_max_age = index_max_age
+        # Local table of every XBRL fact, built from the bulk companyfacts archive.
+        self.fact_store = FactStore(os.path.join(self.folder_path, "FactStore"))
+        # Ticker <-> CIK mapping, loaded on first use.
+        self.cik_index = None
+        self.lock = threading.Lock()
 
     def get_cik(self, ticker: str):
-        df = pd.read_csv(self.cik_file, sep="|")
+        """
+        :return: 10 digit CIK of the ticker, or None if the ticker is not found.
+        """
+        return self.get_cik_index()["ticker_to_cik"].get(ticker.upper())
+
+    """-------------------------------"""
+
+    def get_ciks(self, tickers: list) -> dict:
+        """
+        :return: Dictionary of ticker: CIK. Tickers that are not found map to None.
+        """
+        ticker_to_cik = self.get_cik_index()["ticker_to_cik"]
+        return {ticker: ticker_to_cik.get(ticker.upper()) for ticker in tickers}
+
+    """-------------------------------"""
+
+    def get_tickers(self, cik) -> list:
+        """
+        :param cik: CIK with or without the leading zeros.
+        :return: Every ticker listed under the CIK. Ex: Share classes "GOOG" and "GOOGL".
+        """
+        return list(self.get_cik_index()["cik_to_tickers"].get(str(cik).zfill(10), []))
+
+    """-------------------------------"""
+
+    def get_cik_index(self) -> dict:
+        """
+        Load the ticker <-> CIK mapping once. The mapping is read from "cik_index.json.gz", which is rebuilt
+        whenever "cik_data.csv" is newer than it.
 
+        :return: Dictionary with the keys "ticker_to_cik" and "cik_to_tickers".
+        """
+        with self.lock:
+            if self.cik_index is None:
+                self.cik_index = self.load_cik_index()
+            return self.cik_index
+
+    """-------------------------------"""
+
+    def load_cik_index(self) -> dict:
+        index_file = os.path.join(self.folder_path, "cik_index.json.gz")
         try:
-            cik = df.loc[df["Ticker"] == ticker.upper(), "CIK"].iloc[0]
-            cik = str(cik).zfill(
-                10
-            )  # Add leading zero prefix. The total string length should *ONLY EVER* be 10 characters long.
-            return cik
-        except IndexError:  # If ticker is not found.
-            return None
+            csv_mtime = os.path.getmtime(self.cik_file)
+        except OSError:
+            csv_mtime = None
+        try:
+            is_current = csv_mtime is None or os.path.getmtime(index_file) >= csv_mtime
+        except OSError:
+            is_current = False
+
+        ticker_to_cik = None
+        if is_current:
+            try:
+                with gzip.open(index_file, "rt", encoding="utf-8") as f:
+                    ticker_to_cik = json.load(f)
+            except (OSError, ValueError):
+                ticker_to_cik = None
+        if ticker_to_cik is None:
+            if csv_mtime is None:
+                print(f"[Error] CIK file not found: {self.cik_file}")
+                ticker_to_cik = {}
+            else:
+                df = pd.read_csv(
+                    self.cik_file, sep="|", usecols=["Ticker", "CIK"], dtype=str
+                ).dropna()
+                # The first listing of a ticker wins, like the previous lookup.
+                df = df.drop_duplicates("Ticker")
+                # Stored without the leading zeros to keep the file small.
+                ticker_to_cik = dict(
+                    zip(df["Ticker"].str.upper(), df["CIK"].astype(int))
+                )
+                temp_file = f"{index_file}.tmp"
+                with gzip.open(temp_file, "wt", encoding="utf-8") as f:
+                    json.dump(ticker_to_cik, f, separators=(",", ":"))
+                os.replace(temp_file, index_file)
+
+        # Add leading zero prefix. The total string length should *ONLY EVER* be 10 characters long.
+        ticker_to_cik = {
+            ticker: str(cik).zfill(10) for ticker, cik in ticker_to_cik.items()
+        }
+        cik_to_tickers = {}
+        for ticker, cik in ticker_to_cik.items():
+            cik_to_tickers.setdefault(cik, []).append(ticker)
+        return {"ticker_to_cik": ticker_to_cik, "cik_to_tickers": cik_to_tickers}
 
     def get_filing_history(self, ticker: str):
         cik = self.get_cik(ticker)
-        query = f"https://data.sec.gov/submissions/CIK{cik}.json"
-        print(f"Query: {query}")
-        response = requests.get(query)
-        print(f"Response: {response.status_code}")
+        if cik is None:
+            return None
+        return self.get_submissions(cik)
+
+    """-------------------------------"""
+
+    def get_submissions(self, cik: str) -> dict:
+        """
+        :param cik: 10 digit CIK. Ex: "0000320193"
+        :return: The submissions JSON of the company, or None if it could not be retrieved.
+        """
+        with self.lock:
+            if cik in self.submissions:
+                return self.submissions[cik]
+        data = self.query_sec("SUBMISSIONS", submissions_url.format(cik), cik)
+        if data is not None:
+            with self.lock:
+                self.submissions[cik] = data
+        return data
+
+    """-------------------------------"""
+
+    def query_sec(self, function: str, url: str, cik: str) -> dict:
+        """
+        Every data.sec.gov request goes through this function. Responses are cached on disk.
+
+        :param function: Name of the cache folder. Ex: "SUBMISSIONS"
+        :return: Parsed JSON response, or None if the request failed.
+        """
+        params = {"cik": cik}
+        data = self.response_cache.get(function, params)
+        if data is None and not self.response_cache.offline:
+            response = get_transport().get(url, headers=sec_headers)
+            if response.status_code != 200:
+                print(f"[Error] {function} for CIK {cik}: {response.status_code}")
+                return None
+            data = response.json()
+            self.response_cache.put(function, params, data)
+        return data
+
+    """-------------------------------"""
+
+    def build_filing_index(
+        self, archive_path: str = None, forms: list = None, download: bool = False
+    ) -> int:
+        """
+        Build the local filing index from the SEC bulk submissions archive. Once it exists, filings are read from it
+        instead of the web.
+
+        :param archive_path: Path to submissions.zip. Defaults to the index folder.
+        :param forms: Form types to keep. Ex: ["10-K", "10-Q"]. None keeps every form.
+        :param download: Download the archive even if a local copy exists.
+        :return: Number of filings in the index.
+        """
+        if archive_path is None:
+            archive_path = os.path.join(
+                self.filing_index.folder_path, "submissions.zip"
+            )
+        if download or not os.path.exists(archive_path):
+            self.filing_index.download_archive(archive_path, headers=sec_headers)
+        return self.filing_index.build(archive_path, forms=forms)
+
+    """-------------------------------"""
+
+    def build_fact_store(
+        self,
+        archive_path: str = None,
+        taxonomies: tuple = ("us-gaap", "dei"),
+        download: bool = False,
+    ) -> int:
+        """
+        Build the local XBRL fact store from the SEC bulk companyfacts archive. Once it exists, company facts are read
+        from it instead of the web.
+
+        :param archive_path: Path to companyfacts.zip. Defaults to the store folder.
+        :param taxonomies: Taxonomies to keep. None keeps every taxonomy.
+        :param download: Download the archive even if a local copy exists.
+        :return: Number of facts in the store.
+        """
+        if archive_path is None:
+            archive_path = os.path.join(self.fact_store.folder_path, "companyfacts.zip")
+        if download or not os.path.exists(archive_path):
+            self.fact_store.download_archive(archive_path, headers=sec_headers)
+        return self.fact_store.build(archive_path, taxonomies=taxonomies)
+
+    """-------------------------------"""
+
+    def get_company_facts(self, ticker: str) -> pd.DataFrame:
+        """
+        :return: DataFrame with one row per XBRL fact of the company. See fact_store.fact_columns for the columns.
+                 None if the facts could not be retrieved.
+        """
+        cik = self.get_cik(ticker)
+        if cik is None:
+            return None
+        if self.fact_store.exists():
+            facts = self.fact_store.get_facts(cik)
+            if facts is not None:
+                return facts
+        data = self.query_sec("COMPANYFACTS", companyfacts_url.format(cik), cik)
+        if data is None:
+            return None
+        return facts_to_frame(parse_company_facts(data, cik=int(cik)))
+
+    """-------------------------------"""
+
+    def get_statement_reports(self, ticker: str, statement: str) -> dict:
+        """
+        Build a statement from the company's XBRL facts, in the same layout as EquityScraper.get_statement_reports.
+        No Alpha Vantage quota is used.
+
+        :param statement: "income_statement", "balance_sheet" or "cash_flow".
+        :return: Dictionary with the keys "quarterly" and "annual". None if the facts could not be retrieved.
+        """
+        facts = self.get_company_facts(ticker)
+        if facts is None or facts.empty:
+            return None
+        tags = [tag for tags in statement_tags[statement].values() for tag in tags]
+        facts = facts[facts["tag"].isin(tags)]
+        reports = {}
+        for freq in ["quarterly", "annual"]:
+            df = build_statement(facts, statement, freq)
+            if (
+                statement == "cash_flow"
+                and "operatingCashflow" in df.index
+                and "capitalExpenditures" in df.index
+            ):
+                df.loc["freeCashflow"] = (
+                    df.loc["operatingCashflow"] - df.loc["capitalExpenditures"]
+                )
+            reports[freq] = df
+        return reports
+
+    """-------------------------------"""
+
+    def get_report_periods(self, ticker: str, form: str = "10-K") -> pd.DataFrame:
+        """
+        :param form: Form type to keep. Ex: "10-K", "10-Q". None for every form.
+        :return: DataFrame of the recent filings with the columns form, filingDate, reportDate and accessionNumber, newest first.
+        """
+        cik = self.get_cik(ticker)
+        if cik is not None and self.is_index_fresh():
+            filings = self.filing_index.get_filings(cik, form=form)
+            if not self.is_filing_due(filings, form):
+                return filings
+        data = self.get_submissions(cik) if cik is not None else None
+        if data is None:
+            return pd.DataFrame(
+                columns=["form", "filingDate", "reportDate", "accessionNumber"]
+            )
+        recent = data["filings"]["recent"]
+        filings = pd.DataFrame(
+            {
+                col: recent[col]
+                for col in ["form", "filingDate", "reportDate", "accessionNumber"]
+            }
+        )
+        if form is not None:
+            filings = filings[filings["form"] == form]
+        return filings.reset_index(drop=True)
+
+    """-------------------------------"""
+
+    def is_index_fresh(self) -> bool:
+        """
+        :return: True if the filing index exists and its archive is at most "index_max_age" days old.
+        """
+        if not self.filing_index.exists():
+            return False
+        age = dt.datetime.now() - self.filing_index.get_data_date()
+        return age <= dt.timedelta(days=self.index_max_age)
+
+    """-------------------------------"""
+
+    def is_filing_due(self, filings: pd.DataFrame, form: str) -> bool:
+        """
+        :param filings: Filings of a company read from the index, newest first.
+        :return: True if a filing newer than the latest one in "filings" is expected. See "filing_intervals".
+        """
+        if filings.empty:
+            return True
+        interval = filing_intervals.get(form)
+        if interval is None:
+            return False
+        latest = pd.Timestamp(filings["filingDate"].iloc[0])
+        return dt.datetime.now() - latest > dt.timedelta(days=interval)
+
+    """-------------------------------"""
+
+    def get_fiscal_year_end_date(self, ticker: str) -> str:
+        """
+        :return: Period of report of the most recent 10-K. Ex: "2023-09-30". None if the company has no 10-K.
+        """
+        filings = self.get_report_periods(ticker, form="10-K")
+        filings = filings[filings["reportDate"] != ""]
+        if filings.empty:
+            return None
+        return filings["reportDate"].iloc[0]
+
+    """-------------------------------"""
+
+    def get_fiscal_year_end_dates(self, tickers: list, max_workers: int = 4) -> dict:
+        """
+        Resolve the fiscal year end of several companies. Submissions that are not cached are downloaded in parallel.
+
+        :return: Dictionary of ticker: fiscal year end date.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dates = executor.map(self.get_fiscal_year_end_date, tickers)
+            return dict(zip(tickers, dates))
 
 
 if __name__ == "__main__":
     ticker = "AAPL"
     folder_path = "D:\\FinancialData\\FinancialData\\EquityData\\CIK"
     s = SecScraper(folder_path)
-    cik = s.get_filing_history(ticker)
+    fiscal_end = s.get_fiscal_year_end_date(ticker)
 
-    print(f"CIK: {cik}")
+    print(f"Fiscal year end: {fiscal_end}")
@@ -2,25 +2,34 @@
 
 # Selenium imports
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+
 # Pandas
 import pandas as pd
 import numpy as np
 
-chrome_options = webdriver.ChromeOptions()
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-popup-blocking")
-# chrome_options.add_argument("--headless") NOTE: Running in headless will result in empty dataframes.
-chrome_options.add_argument("--disable-gpu")
+from FinancialScrapers.Scrapers.html_table import parse_tables
+from FinancialScrapers.Scrapers.driver_pool import get_driver_pool
+from FinancialScrapers.Scrapers.browser_profile import user_agent
+
+# Requests imports
+import requests
+from FinancialScrapers.Scrapers.http_transport import get_transport
 
+# Headers for plain HTTP requests. The site serves the same page to browsers and scripts.
+http_headers = {
+    "User-Agent": user_agent,
+    "Accept": "text/html,application/xhtml+xml",
+}
 
 xpaths = {
     "col": [
@@ -38,14 +47,46 @@ xpaths = {
     "qtr_button": "/html/body/div/div[1]/div[2]/main/div[2]/nav[2]/ul/li[2]/button",
 }
 
+# Serializes the largest table inside of <main> in one call.
+extract_table_js = """
+const tables = Array.from(document.querySelectorAll("main table"));
+if (tables.length === 0) { return null; }
+const table = tables.reduce((a, b) => (b.rows.length > a.rows.length ? b : a));
+const text = (cell) => (cell.innerText || cell.textContent || "").trim();
+const headerRow = table.querySelector("thead tr");
+return {
+    headers: headerRow ? Array.from(headerRow.querySelectorAll("th, td")).map(text) : [],
+    rows: Array.from(table.querySelectorAll("tbody tr")).map(
+        (tr) => Array.from(tr.querySelectorAll("td, th")).map(text)
+    ),
+};
+"""
+
 
 class StockAnalysis:
-    def __init__(self, driver_path: str, halt_scrape: bool = False) -> None:
+    def __init__(
+        self,
+        driver_path: str = None,
+        halt_scrape: bool = False,
+        single_pass: bool = True,
+        use_http: bool = True,
+        browser_profile: str = "fast",
+    ) -> None:
         self.halt_scrape = (
             halt_scrape  # Determine if scraping is stopped if element is not found.
         )
-
-        self.chrome_driver = "D:\\ChromeDriver\\chromedriver.exe"
+        # Read the whole table with one script call instead of one xpath lookup per cell.
+        self.single_pass = single_pass
+        # Fetch pages over plain HTTP and only fall back to Chrome when the table cannot be parsed.
+        self.use_http = use_http
+        # Chrome profile used when the page has to be rendered. "visible", "headless" or "fast".
+        self.browser_profile = browser_profile
+
+        if driver_path is None:
+            driver_path = "D:\\ChromeDriver\\chromedriver.exe"
+        self.chrome_driver = driver_path
+        # Driver checked out of the shared pool. None while no page is open.
+        self.browser = None
         # Variables for financial statements.
         self.income_statement = pd.DataFrame()
         self.balance_sheet = pd.DataFrame()
@@ -61,8 +102,11 @@ class StockAnalysis:
         :param url: The website to visit.
         :return: None
         """
-        service = Service(executable_path=self.chrome_driver)
-        self.browser = webdriver.Chrome(service=service, options=chrome_options)
+        # Reuse a driver from the shared pool instead of launching Chrome for every page.
+        self.release_browser()
+        self.browser = get_driver_pool(
+            self.chrome_driver, self.browser_profile
+        ).checkout()
         # Default browser route
         if url == None:
             self.browser.get(url=self.sec_quarterly_url)
@@ -70,206 +114,160 @@ class StockAnalysis:
         else:
             self.browser.get(url=url)
 
+    def release_browser(self) -> None:
+        """
+        Return the driver to the shared pool.
+        """
+        if self.browser is not None:
+            browser, self.browser = self.browser, None
+            get_driver_pool(self.chrome_driver, self.browser_profile).checkin(browser)
+
     def scrape_income_statement(self, ticker: str, freq: str = "q"):
-        if freq in self.annual_params:
-            freq = "a"
-            func_name = "scrape_income_statement(a)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/"
-            self.create_browser(url)
+        return self.scrape_statement(
+            ticker, "financials/", freq, "scrape_income_statement"
+        )
 
-        elif freq in self.quarter_params:
-            freq = "q"
-            func_name = "scrape_income_statement(q)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/?p=quarterly"
-            self.create_browser(url)
-            qtr_button_xpath = xpaths["qtr_button"]
-            self.click_button(qtr_button_xpath, wait=True, wait_time=10)
-        base_row_xpath = xpaths["row"]
-        base_col_xpath = xpaths["col"]
-        row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-        col_count = self.count_columns(xpath=base_col_xpath)
-        if row_count == 0 or col_count == 0:
-            base_row_xpath = xpaths["row2"]
-            base_col_xpath = xpaths["col2"]
-            row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-            col_count = self.count_columns(xpath=base_col_xpath)
-            if row_count == 0 or col_count == 0:
-                if self.halt_scrape:
-                    self.halt_scrape(f"{func_name}")
-                    return
-        row_labels = []
-        table_data = {}
-        for x in range(row_count):
+    """-----------------------------------"""
 
-            row_data = []
-            for y in range(col_count):
-                # Add 1 to adjust for xpath labels.
-                xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/tbody/tr[{x+1}]/td[{y+1}]"
-                data = self.read_data(xpath, wait=True)
-                if y == 0:
-                    row_labels.append(data)
-                else:
-                    row_data.append(data)
-            table_data[row_labels[x]] = row_data
-        table_headers = []
-        for i in range(col_count):
-            xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/thead/tr/th[{i+1}]"
-            header_data = self.read_data(xpath, wait=True)
-            if header_data == "Year" or header_data == "Quarter Ended":
-                pass
-            else:
-                table_headers.append(header_data)
-        table_data["Dates"] = table_headers
-        df = pd.DataFrame(table_data)
-        df.set_index("Dates", inplace=True)
-        df = df.T
-        df = df.iloc[:, ::-1]
+    def scrape_balance_sheet(self, ticker: str, freq: str = "q"):
+        return self.scrape_statement(
+            ticker, "financials/balance-sheet/", freq, "scrape_balance_sheet"
+        )
 
-        return df
+    """-----------------------------------"""
+
+    def scrape_cash_flow(self, ticker: str, freq: str = "q"):
+        return self.scrape_statement(
+            ticker, "financials/cash-flow-statement/", freq, "scrape_cash_flow"
+        )
 
     """-----------------------------------"""
 
-    def scrape_balance_sheet(self, ticker: str, freq: str = "q"):
-        if freq in self.annual_params:
-            freq = "a"
-            func_name = "scrape_balance_sheet(a)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/balance-sheet/"
-            self.create_browser(url)
+    def scrape_test(self, freq):
+        ticker = "AAPL"
 
-        elif freq in self.quarter_params:
-            freq = "q"
-            func_name = "scrape_balance_sheet(q)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/balance-sheet/?p=quarterly"
-            self.create_browser(url)
-            qtr_button_xpath = xpaths["qtr_button"]
-            self.click_button(qtr_button_xpath, wait=True, wait_time=10)
-        base_row_xpath = xpaths["row"]
-        base_col_xpath = xpaths["col"]
-        row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-        col_count = self.count_columns(xpath=base_col_xpath)
-        if row_count == 0 or col_count == 0:
-            base_row_xpath = xpaths["row2"]
-            base_col_xpath = xpaths["col2"]
-            row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-            col_count = self.count_columns(xpath=base_col_xpath)
-            if row_count == 0 or col_count == 0:
-                if self.halt_scrape:
-                    self.halt_scrape(f"{func_name}")
-                    return
-        row_labels = []
-        table_data = {}
-        for x in range(row_count):
-            row_data = []
-            for y in range(col_count):
-                # Add 1 to adjust for xpath labels.
-                xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/tbody/tr[{x+1}]/td[{y+1}]"
-                data = self.read_data(xpath, wait=True)
-                if y == 0:
-                    row_labels.append(data)
-                else:
-                    row_data.append(data)
-            table_data[row_labels[x]] = row_data
-        table_headers = []
-        for i in range(col_count):
-            xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/thead/tr/th[{i+1}]"
-            header_data = self.read_data(xpath, wait=True)
-            if header_data == "Year" or header_data == "Quarter Ended":
-                pass
-            else:
-                table_headers.append(header_data)
-        table_data["Dates"] = table_headers
-        df = pd.DataFrame(table_data)
-        df.set_index("Dates", inplace=True)
-        df = df.T
-        df = df.iloc[:, ::-1]
+    """-----------------------------------"""
 
-        return df
+    def scrape_ratios(self, ticker: str, freq: str = "q"):
+        return self.scrape_statement(
+            ticker,
+            "financials/ratios/",
+            freq,
+            "scrape_ratios",
+            display_dimenstions=True,
+            warn_empty=False,
+        )
 
     """-----------------------------------"""
 
-    def scrape_cash_flow(self, ticker: str, freq: str = "q"):
+    def scrape_statement(
+        self,
+        ticker: str,
+        page: str,
+        freq: str,
+        func_name: str,
+        display_dimenstions: bool = False,
+        warn_empty: bool = True,
+    ):
+        """
+        Read a financial table from stockanalysis.com. The page is fetched over plain HTTP first,
+        and Chrome is only opened if the table cannot be parsed from the response.
+
+        Parameters:
+        page str: Path of the page below the ticker. Ex: "financials/balance-sheet/"
+        func_name str: Name of the calling function, used in log messages.
+
+        Returns:
+        Pandas dataframe representing table from webpage.
+        """
+        url = f"https://stockanalysis.com/stocks/{ticker.lower()}/{page}"
         if freq in self.annual_params:
             freq = "a"
-            _freq = "annual"
-            func_name = "scrape_cash_flow(a)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/cash-flow-statement/"
-            self.create_browser(url)
-
         elif freq in self.quarter_params:
             freq = "q"
-            _freq = "quarter"
-            func_name = "scrape_cash_flow(q)"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/cash-flow-statement/?p=quarterly"
-            self.create_browser(url)
-            qtr_button_xpath = xpaths["qtr_button"]
-            self.click_button(qtr_button_xpath, wait=True, wait_time=10)
-
-        base_row_xpath = xpaths["row"]
-        base_col_xpath = xpaths["col"]
-        row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-        col_count = self.count_columns(xpath=base_col_xpath)
-        if row_count == 0 or col_count == 0:
-            base_row_xpath = xpaths["row2"]
-            base_col_xpath = xpaths["col2"]
-            row_count = self.count_rows(xpath=base_row_xpath, freq=freq)
-            col_count = self.count_columns(xpath=base_col_xpath)
-            if row_count == 0 or col_count == 0:
-                if self.halt_scrape:
-                    self.halt_scrape(f"{func_name}")
-                    return
-        row_labels = []
-        table_data = {}
-        for x in range(row_count):
-
-            row_data = []
-            for y in range(col_count):
-                # Add 1 to adjust for xpath labels.
-                xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/tbody/tr[{x+1}]/td[{y+1}]"
-                data = self.read_data(xpath, wait=True)
-                if y == 0:
-                    row_labels.append(data)
-                else:
-                    row_data.append(data)
-            table_data[row_labels[x]] = row_data
-        table_headers = []
-        for i in range(col_count):
-            xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/thead/tr/th[{i+1}]"
-            header_data = self.read_data(xpath, wait=True)
-            if header_data == "Year" or header_data == "Quarter Ended":
-                pass
-            else:
-                table_headers.append(header_data)
-        table_data["Dates"] = table_headers
-        df = pd.DataFrame(table_data)
-        df.set_index("Dates", inplace=True)
-        df = df.T
-        df = df.iloc[:, ::-1]
+            url = f"{url}?p=quarterly"
+        func_name = f"{func_name}({freq})"
 
+        df = self.fetch_table(url) if self.use_http else None
+        if df is None:
+            self.create_browser(url)
+            try:
+                if freq == "q":
+                    qtr_button_xpath = xpaths["qtr_button"]
+                    self.click_button(qtr_button_xpath, wait=True, wait_time=10)
+                df = self.get_table(freq=freq, display_dimenstions=display_dimenstions)
+            finally:
+                self.release_browser()
+        elif display_dimenstions:
+            print(f"[Table Dimensions]\nRows: {len(df)}\nCols: {len(df.columns) + 1}")
+        if warn_empty and (df is None or df.empty):
+            print(f"[Warning] No table data found in {func_name}.")
         return df
 
     """-----------------------------------"""
 
-    def scrape_test(self, freq):
-        ticker = "AAPL"
+    def fetch_table(self, url: str):
+        """
+        Fetch a page without a browser and parse its financial table. The tables are rendered on the server,
+        so the page source already holds every cell.
+
+        Returns:
+        Pandas dataframe representing table from webpage, or None if the page could not be read.
+        """
+        try:
+            response = get_transport().get(url, headers=http_headers)
+        except requests.RequestException as e:
+            print(f"[fetch_table()] {e}")
+            return None
+        if response.status_code != 200:
+            print(f"[fetch_table()] Status {response.status_code} for {url}")
+            return None
+        tables = [t for t in parse_tables(response.text) if t["headers"] and t["rows"]]
+        if not tables:
+            return None
+        # The financial table is the largest table on the page.
+        table = max(tables, key=lambda t: len(t["rows"]))
+        return self.build_table_frame(table["headers"], table["rows"])
 
     """-----------------------------------"""
 
-    def scrape_ratios(self, ticker: str, freq: str = "q"):
-        if freq in self.annual_params:
-            freq = "a"
-            url = (
-                f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/ratios/"
+    def scrape_many(
+        self,
+        tickers: list,
+        statement: str = "income_statement",
+        freq: str = "q",
+        workers: int = 2,
+    ) -> dict:
+        """
+        Scrape the same statement for several tickers in parallel. Pages that need Chrome use a driver from the
+        shared pool, which grows to "workers" drivers, so at most "workers" Chrome instances are alive at once.
+
+        Parameters:
+        statement str: "income_statement", "balance_sheet", "cash_flow" or "ratios".
+
+        Returns:
+        Dictionary of ticker: dataframe. Tickers that failed are None.
+        """
+
+        def scrape(ticker):
+            # Scrapers keep the open page on the instance, so every worker needs its own.
+            scraper = StockAnalysis(
+                self.chrome_driver,
+                halt_scrape=self.halt_scrape,
+                single_pass=self.single_pass,
+                use_http=self.use_http,
+                browser_profile=self.browser_profile,
             )
-            self.create_browser(url)
-        elif freq in self.quarter_params:
-            freq = "q"
-            url = f"https://stockanalysis.com/stocks/{ticker.lower()}/financials/ratios/?p=quarterly"
-            self.create_browser(url)
-            qtr_button_xpath = xpaths["qtr_button"]
-            self.click_button(qtr_button_xpath, wait=True, wait_time=10)
+            try:
+                return getattr(scraper, f"scrape_{statement}")(ticker, freq=freq)
+            except Exception as e:
+                print(f"[Error] scrape_many({ticker}): {e}")
+                scraper.release_browser()
+                return None
 
-        df = self.get_table(freq=freq, display_dimenstions=True)
-        return df
+        get_driver_pool(self.chrome_driver, self.browser_profile, size=workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(tickers, executor.map(scrape, tickers)))
 
     ################################################################### Table Utilities
     def get_table(self, freq: str, display_dimenstions: bool = False):
@@ -283,9 +281,22 @@ class StockAnalysis:
         Pandas dataframe representing table from webpage.
         """
 
+        if self.single_pass:
+            table = self.extract_table()
+            if table is not None:
+                df = self.build_table_frame(table["headers"], table["rows"])
+                if df is not None:
+                    if display_dimenstions:
+                        print(
+                            f"[Table Dimensions]\nRows: {len(df)}\nCols: {len(df.columns) + 1}"
+                        )
+                    return df
+            print("[get_table()] Single pass extraction failed. Reading cell by cell.")
+
         dimensions = self.get_table_dimensions(freq=freq)
         row_count = dimensions["row"]
         col_count = dimensions["col"]
+        table_xpath = xpaths["row"][dimensions["index"]].split("/tbody")[0]
 
         if display_dimenstions:
             print(f"[Table Dimensions]\nRows: {row_count}\nCols: {col_count}")
@@ -297,7 +308,7 @@ class StockAnalysis:
             row_data = []
             for y in range(col_count):
                 # Add 1 to adjust for xpath labels.
-                xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/tbody/tr[{x+1}]/td[{y+1}]"
+                xpath = f"{table_xpath}/tbody/tr[{x+1}]/td[{y+1}]"
                 try:
                     data = self.read_data(xpath, wait=True)
                 except TimeoutException:
@@ -309,7 +320,7 @@ class StockAnalysis:
             table_data[row_labels[x]] = row_data
         table_headers = []
         for i in range(col_count):
-            xpath = f"/html/body/div/div[1]/div[2]/main/div[5]/table/thead/tr/th[{i+1}]"
+            xpath = f"{table_xpath}/thead/tr/th[{i+1}]"
             header_data = self.read_data(xpath, wait=True)
             if header_data == "Year" or header_data == "Quarter Ended":
                 pass
@@ -323,90 +334,95 @@ class StockAnalysis:
 
         return df
 
-    def get_table_dimensions(self, freq: str = "q"):
+    def extract_table(self) -> dict:
         """
-        Counts how many rows and columns are in a table. Will cycle through xpaths if initial attemps are not found.
+        Read the financial table in a single call. The table is serialized by a script in the browser,
+        and the page source is parsed locally if the script does not find it.
 
         Returns:
-        Dictionary with keys for row and column
+        Dictionary with the "headers" and "rows" of the table, or None if no table was found.
+        """
+        try:
+            table = self.browser.execute_script(extract_table_js)
+        except WebDriverException:
+            table = None
+        if table and table["rows"]:
+            return table
+        tables = parse_tables(self.browser.page_source)
+        # The financial table is the largest table on the page.
+        tables = [t for t in tables if t["headers"] and t["rows"]]
+        if not tables:
+            return None
+        return max(tables, key=lambda t: len(t["rows"]))
+
+    def build_table_frame(self, headers: list, rows: list) -> pd.DataFrame:
         """
+        Build the same dataframe as the cell by cell scrape: one column per period, oldest on the left.
 
-        index = 0
-        counting = True
-        while counting:
-            row_xpath = xpaths["row"][index]
-            col_xpath = xpaths["col"][index]
-            row_count = self.count_rows(row_xpath, freq=freq, attempt=index)
-            col_count = self.count_columns(col_xpath)
-            if row_count != 0 and col_count != 0:
+        Parameters:
+        headers list: Text of the header cells. The first one is the row label column.
+        rows list: Text of the cells in each row. The first cell is the row label.
+        """
+        # Stop at the first premium column. Ex: "2013 - 2009" or "+10 Quarters"
+        col_count = len(headers)
+        for i, header in enumerate(headers):
+            if " - " in header or "+" in header:
+                col_count = i
                 break
+        if col_count == 0 or not rows:
+            return None
+        table_data = {}
+        for row in rows:
+            row = list(row[:col_count])
+            # Pad rows that are missing cells.
+            row += [np.nan] * (col_count - len(row))
+            table_data[row[0]] = row[1:]
+        table_headers = [
+            header
+            for header in headers[:col_count]
+            if header != "Year" and header != "Quarter Ended"
+        ]
+        # The label header is not always "Year" or "Quarter Ended".
+        if len(table_headers) == col_count:
+            table_headers = table_headers[1:]
+        table_data["Dates"] = table_headers
+        df = pd.DataFrame(table_data)
+        df.set_index("Dates", inplace=True)
+        df = df.T
+        df = df.iloc[:, ::-1]
+        return df
 
-            index += 1
-        return {"row": row_count, "col": col_count}
-
-    """-----------------------------------"""
-
-    def count_rows(
-        self, xpath: str, freq: str, log_xpath: bool = False, attempt: int = 0
-    ):
-        row_running = True
-        row_index = 1
-        row_count = 0
-        row_labels = []
-        if log_xpath:
-            print(f"-- [count_rows() Xpath] {xpath}")
-        while row_running:
-            try:
-                if row_index == 1:
-                    if freq == "q":
-                        _xpath = xpaths["header"][attempt].format(1)
-                    elif freq == "a":
-                        _xpath = xpaths["header"][attempt].format(1)
-                else:
-                    _xpath = xpath.format(row_index)
-
-                row_data = self.read_data(_xpath, wait=True, wait_time=10)
-                row_count += 1
-                row_index += 1
-            except NoSuchElementException:
-                print(f"[count_rows()] NoSuchElementException")
-                row_running = False
-            except TimeoutException:
-                print(f"[count_rows()] TimeOutException")
-                row_running = False
-
-        if row_count == 0:
-            print(f"[Warning] 0 rows collected")
-        return row_count
-
-    """-----------------------------------"""
+    def get_table_dimensions(self, freq: str = "q", wait_time: int = 10):
+        """
+        Counts how many rows and columns are in a table. Every row and header cell is read with a single find_elements call,
+        and the xpath variants are tried in order until one of them holds a table.
 
-    def count_columns(self, xpath: str, log_xpath: bool = False):
-        col_running = True
-        col_index = 1
-        col_count = 0
-        if log_xpath:
-            print(f"-- [count_columns() Xpath] {xpath}")
-        while col_running:
-            try:
-                _xpath = xpath.format(col_index)
-                row_data = self.read_data(_xpath, wait=True, wait_time=10)
-                # Exclude premium rows from count.
-                if " - " in row_data or "+" in row_data:
-                    col_running = False
+        Returns:
+        Dictionary with keys for row, column, and the index of the xpath variant that matched.
+        """
+        # Wait once for the page to render a table, then check every variant against the loaded page.
+        try:
+            WebDriverWait(self.browser, wait_time).until(
+                EC.presence_of_element_located((By.XPATH, "//main//table"))
+            )
+        except TimeoutException:
+            print(f"[get_table_dimensions()] TimeoutException")
+        for index in range(len(xpaths["row"])):
+            # Ex: ".../main/div[5]/table/tbody/tr[{}]/td[1]" -> ".../main/div[5]/table"
+            table_xpath = xpaths["row"][index].split("/tbody")[0]
+            rows = self.browser.find_elements(By.XPATH, f"{table_xpath}/tbody/tr")
+            headers = self.browser.find_elements(By.XPATH, f"{table_xpath}/thead/tr/th")
+            col_count = 0
+            for header in headers:
+                # Exclude premium columns from count.
+                if " - " in header.text or "+" in header.text:
                     break
                 col_count += 1
-                col_index += 1
-            except NoSuchElementException:
-                print(f"[count_columns()] NoSuchElementException")
-                col_running = False
-            except TimeoutException:
-                print(f"[count_columns()] TimeoutException")
-                col_running = False
-
-        if col_count == 0:
-            print(f"[Warning] 0 columns collected")
-        return col_count
+            if rows and col_count:
+                return {"row": len(rows), "col": col_count, "index": index}
+
+        print(f"[Warning] 0 rows collected")
+        return {"row": 0, "col": 0, "index": 0}
 
     """-----------------------------------"""
 